@@ -155,6 +155,8 @@ class EightPuzzleState:
               EightPuzzleState([1, 0, 2, 3, 4, 5, 6, 7, 8]).result('left')
           True
         """
+        if not isinstance(other, EightPuzzleState):
+            return False
         for row in range( 3 ):
             if self.cells[row] != other.cells[row]:
                 return False
@@ -196,7 +198,7 @@ class EightPuzzleSearchProblem(search.SearchProblem):
         self.puzzle = puzzle
 
     def getStartState(self):
-        return puzzle
+        return self.puzzle
 
     def isGoalState(self,state):
         return state.isGoal()
@@ -235,6 +237,22 @@ class EightPuzzleSearchProblem(search.SearchProblem):
         """
         return len(actions)
 
+    def encode(self, state):
+        "The numbers of the cells, row by row, as the digits of a base 9 int"
+        code = 0
+        for row in state.cells:
+            for number in row:
+                code = code * 9 + number
+        return code
+
+    def decode(self, code):
+        numbers = []
+        for i in range(9):
+            code, number = divmod(code, 9)
+            numbers.append(number)
+        numbers.reverse()
+        return EightPuzzleState(numbers)
+
 EIGHT_PUZZLE_DATA = [[1, 0, 2, 3, 4, 5, 6, 7, 8],
                      [1, 7, 8, 2, 3, 4, 5, 6, 0],
                      [4, 3, 2, 7, 0, 5, 1, 6, 8],
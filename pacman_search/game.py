@@ -166,7 +166,17 @@ class Grid:
     y vertical and the origin (0,0) in the bottom left corner.
 
     The __str__ method constructs an output that is oriented like a pacman board.
+
+    freeze() makes a grid immutable; a frozen grid computes its hash, count
+    and asList once and remembers them.  A changed version of a frozen grid
+    is made through builder(), a mutable copy that is frozen in turn.
     """
+    # the memos start out as class attributes so that making and freezing a grid stays cheap
+    frozen = False
+    _hash = _count = _list = _int = None
+    # cells per int of packBits, also read by the other grids so that they pack the same way
+    CELLS_PER_INT = 30
+
     def __init__(self, width, height, initialValue=False, bitRepresentation=None):
         if initialValue not in [False, True]: raise Exception('Grids can only contain booleans')
         self.CELLS_PER_INT = 30
@@ -181,6 +191,7 @@ class Grid:
         return self.data[i]
 
     def __setitem__(self, key, item):
+        if self.frozen: raise Exception('A frozen grid can not be changed; change a builder() copy instead')
         self.data[key] = item
 
     def __str__(self):
@@ -190,60 +201,139 @@ class Grid:
 
     def __eq__(self, other):
         if other == None: return False
+        if not hasattr(other, 'data'):
+            # a BitGrid or ArrayGrid keeps its cells elsewhere, so compare them through asInt
+            if not hasattr(other, 'asInt'): return False
+            return self.width == other.width and self.height == other.height and self.asInt() == other.asInt()
+        if self.frozen or getattr(other, 'frozen', False):
+            return self.width == other.width and self.height == other.height and self.asInt() == other.asInt()
         return self.data == other.data
 
     def __hash__(self):
         # return hash(str(self))
-        base = 1
-        h = 0
-        for l in self.data:
-            for i in l:
-                if i:
-                    h += base
-                base *= 2
-        return hash(h)
+        if self.frozen:
+            if self._hash == None:
+                self._hash = hash(self.asInt())
+            return self._hash
+        return hash(self.asInt())
 
-    def copy(self):
-        g = Grid(self.width, self.height)
-        g.data = [x[:] for x in self.data]
+    def freeze(self):
+        """
+        Makes the grid immutable and returns it: the columns become tuples and
+        the grid remembers its hash, count and asList from then on.
+        """
+        if not self.frozen:
+            self.data = [tuple(column) for column in self.data]
+            self.frozen = True
+        return self
+
+    def builder(self):
+        "A mutable copy of the grid, to change and then freeze()"
+        return self.copy()
+
+    def withCell(self, x, y, value):
+        """
+        Returns a frozen grid equal to this one except that cell (x, y) holds
+        value.  A frozen grid whose cell already holds value is returned
+        itself, otherwise the new grid shares every column of this (frozen)
+        grid except column x, so an update copies one column instead of the
+        whole grid.
+        """
+        if self.frozen and self.data[x][y] == value:
+            return self
+        columns = self.data if self.frozen else [tuple(column) for column in self.data]
+        column = list(columns[x])
+        column[y] = value
+        data = list(columns)
+        data[x] = tuple(column)
+        g = self._withData(data)
+        g.frozen = True
+        if self.frozen and self._count != None and value in [False, True]:
+            g._count = self._count + (1 if value else -1)
+        return g
+
+    def _withData(self, data):
+        # a grid of the same size around data, without filling in cells that are thrown away
+        g = Grid.__new__(Grid)
+        g.CELLS_PER_INT = self.CELLS_PER_INT
+        g.width, g.height, g.data = self.width, self.height, data
         return g
 
+    def copy(self):
+        return self._withData([list(x) for x in self.data])
+
     def deepCopy(self):
         return self.copy()
 
     def shallowCopy(self):
-        g = Grid(self.width, self.height)
-        g.data = self.data
-        return g
+        # a frozen grid can not change, so sharing it is as good as a copy
+        if self.frozen:
+            return self
+        return self._withData(self.data)
 
     def count(self, item =True ):
+        if self.frozen and item == True:
+            if self._count == None:
+                self._count = sum([x.count(item) for x in self.data])
+            return self._count
         return sum([x.count(item) for x in self.data])
 
     def asList(self, key = True):
+        if self.frozen and key == True:
+            if self._list == None:
+                self._list = tuple(self._cells(key))
+            return list(self._list)
+        return self._cells(key)
+
+    def _cells(self, key):
         list = []
         for x in range(self.width):
             for y in range(self.height):
                 if self[x][y] == key: list.append( (x,y) )
         return list
 
+    def asInt(self):
+        """
+        Returns the grid as one int whose bit x * height + y is cell (x, y)
+        """
+        if self.frozen:
+            if self._int == None:
+                self._int = self._bits()
+            return self._int
+        return self._bits()
+
+    def _bits(self):
+        cells = ['1' if cell else '0' for column in reversed(self.data) for cell in reversed(column)]
+        return int(''.join(cells) or '0', 2)
+
     def packBits(self):
         """
         Returns an efficient int list representation
 
         (width, height, bitPackedInts...)
+
+        Each int holds CELLS_PER_INT cells in the order of their index
+        x * height + y, the first one in the highest bit; the last int is
+        padded with False cells (and is 0 when the cells fill the ints up).
+        """
+        # the cells are written out as binary digits and every CELLS_PER_INT of them read back as one int
+        size = self.CELLS_PER_INT
+        cells = ''.join(['1' if cell else '0' for column in self.data for cell in column])
+        cells = cells.ljust((len(cells) // size + 1) * size, '0')
+        return tuple([self.width, self.height] + [int(cells[i:i + size], 2) for i in range(0, len(cells), size)])
+
+    def toBytes(self):
+        """
+        Returns the grid as bytes: the width and the height as 4 byte ints,
+        then asInt() in (width * height + 7) // 8 bytes, all little endian.
+        gridFromBytes reads them back.
         """
-        bits = [self.width, self.height]
-        currentInt = 0
-        for i in range(self.height * self.width):
-            bit = self.CELLS_PER_INT - (i % self.CELLS_PER_INT) - 1
-            x, y = self._cellIndexToPosition(i)
-            if self[x][y]:
-                currentInt += 2 ** bit
-            if (i + 1) % self.CELLS_PER_INT == 0:
-                bits.append(currentInt)
-                currentInt = 0
-        bits.append(currentInt)
-        return tuple(bits)
+        cells = self.width * self.height
+        return self.width.to_bytes(4, 'little') + self.height.to_bytes(4, 'little') + self.asInt().to_bytes((cells + 7) // 8, 'little')
+
+    def __reduce__(self):
+        # pickles (recorded games, states sent to worker processes) keep the bytes instead of a list per column
+        return (gridFromBytes, (self.toBytes(), self.frozen))
 
     def _cellIndexToPosition(self, index):
         x = index // self.height
@@ -254,27 +344,355 @@ class Grid:
         """
         Fills in data from a bit-level representation
         """
-        cell = 0
+        size = self.CELLS_PER_INT
         for packed in bits:
-            for bit in self._unpackInt(packed, self.CELLS_PER_INT):
-                if cell == self.width * self.height: break
-                x, y = self._cellIndexToPosition(cell)
-                self[x][y] = bit
-                cell += 1
-
-    def _unpackInt(self, packed, size):
-        bools = []
-        if packed < 0: raise ValueError("must be a positive integer")
-        for i in range(size):
-            n = 2 ** (self.CELLS_PER_INT - i - 1)
-            if packed >= n:
-                bools.append(True)
-                packed -= n
-            else:
-                bools.append(False)
-        return bools
+            if packed < 0: raise ValueError("must be a positive integer")
+            if packed >> size: raise ValueError("must be less than 2 ** %d" % size)
+        cells = ''.join([format(packed, '0%db' % size) for packed in bits])
+        # a representation that is too short leaves the cells after it as they are
+        for x in range(self.width):
+            column = cells[x * self.height:(x + 1) * self.height]
+            self.data[x][:len(column)] = [cell == '1' for cell in column]
+
+class BitGrid:
+    """
+    A Grid of booleans stored as the bits of one int: bit x * height + y is
+    cell (x, y), the same layout as Grid.asInt.  grid[x][y] reads and writes
+    the bits through a BitColumn view.
+
+    Python ints are immutable, so a copy shares the int and costs a few
+    bytes, hash and equality work on the one int, and count is a popcount.
+    Unlike a Grid, a shallowCopy is an independent copy too.  freeze() and
+    builder() work as for a Grid.
+    """
+    # the memos start out as class attributes so that making and freezing a grid stays cheap
+    frozen = False
+    _hash = _count = _list = None
+
+    def __init__(self, width, height, initialValue=False, bits=None):
+        if initialValue not in [False, True]: raise Exception('Grids can only contain booleans')
+        self.width = width
+        self.height = height
+        if bits == None:
+            bits = (1 << (width * height)) - 1 if initialValue else 0
+        self.bits = bits
+
+    def __getitem__(self, x):
+        return BitColumn(self, x)
+
+    def __setitem__(self, x, column):
+        for y, value in enumerate(column):
+            self.set(x, y, value)
+
+    def get(self, x, y):
+        return (self.bits >> (x * self.height + y)) & 1 == 1
+
+    def set(self, x, y, value):
+        if self.frozen: raise Exception('A frozen grid can not be changed; change a builder() copy instead')
+        bit = 1 << (x * self.height + y)
+        if value:
+            self.bits |= bit
+        else:
+            self.bits &= ~bit
+
+    def __str__(self):
+        out = [[str(self.get(x, y))[0] for x in range(self.width)] for y in range(self.height)]
+        out.reverse()
+        return '\n'.join([''.join(x) for x in out])
+
+    def __eq__(self, other):
+        if other == None or not hasattr(other, 'asInt'): return False
+        return self.width == other.width and self.height == other.height and self.bits == other.asInt()
+
+    def __hash__(self):
+        if self.frozen:
+            if self._hash == None:
+                self._hash = hash(self.bits)
+            return self._hash
+        return hash(self.bits)
+
+    def freeze(self):
+        "Makes the grid immutable and returns it; from then on it remembers its hash, count and asList"
+        self.frozen = True
+        return self
+
+    def builder(self):
+        "A mutable copy of the grid, to change and then freeze()"
+        return self.copy()
+
+    def withCell(self, x, y, value):
+        "Returns a frozen grid equal to this one except that cell (x, y) holds value, as Grid.withCell"
+        if self.frozen and self.get(x, y) == value:
+            return self
+        bit = 1 << (x * self.height + y)
+        g = BitGrid(self.width, self.height, bits=self.bits | bit if value else self.bits & ~bit)
+        g.frozen = True
+        if self.frozen and self._count != None:
+            g._count = self._count + (1 if value else -1)
+        return g
+
+    def copy(self):
+        return BitGrid(self.width, self.height, bits=self.bits)
+
+    def deepCopy(self):
+        return self.copy()
+
+    def shallowCopy(self):
+        if self.frozen:
+            return self
+        return self.copy()
+
+    def count(self, item=True):
+        if self.frozen:
+            if self._count == None:
+                self._count = self.bits.bit_count()
+            ones = self._count
+        else:
+            ones = self.bits.bit_count()
+        return ones if item else self.width * self.height - ones
+
+    def asList(self, key=True):
+        if self.frozen and key == True:
+            if self._list == None:
+                self._list = tuple(self._cells(key))
+            return list(self._list)
+        return self._cells(key)
+
+    def _cells(self, key):
+        bits = self.bits if key else ~self.bits & ((1 << (self.width * self.height)) - 1)
+        # one pass over the binary digits, lowest bit first; clearing the bits one by one would copy the int every time
+        digits = bin(bits)[:1:-1]
+        list = []
+        i = digits.find('1')
+        while i >= 0:
+            list.append(divmod(i, self.height))
+            i = digits.find('1', i + 1)
+        return list
+
+    def asInt(self):
+        return self.bits
+
+    def asGrid(self):
+        "The same cells as a list of lists Grid"
+        return gridFromInt(self.width, self.height, self.bits)
+
+    def packBits(self):
+        "The same (width, height, bitPackedInts...) tuple as Grid.packBits, read off the int"
+        # the binary digits of bits, lowest first, are the cells in the order Grid.packBits writes them
+        size = Grid.CELLS_PER_INT
+        cells = bin(self.bits)[:1:-1].ljust(self.width * self.height, '0')
+        cells = cells.ljust((len(cells) // size + 1) * size, '0')
+        return tuple([self.width, self.height] + [int(cells[i:i + size], 2) for i in range(0, len(cells), size)])
+
+class BitColumn:
+    "Column x of a BitGrid, read and written as grid[x][y]"
+    def __init__(self, grid, x):
+        self.grid = grid
+        self.x = x
+
+    def __getitem__(self, y):
+        return self.grid.get(self.x, y)
+
+    def __setitem__(self, y, value):
+        self.grid.set(self.x, y, value)
+
+    def __len__(self):
+        return self.grid.height
+
+    def __iter__(self):
+        return (self.grid.get(self.x, y) for y in range(self.grid.height))
+
+def bitGrid(grid):
+    "The BitGrid with the same cells as grid"
+    return BitGrid(grid.width, grid.height, bits=grid.asInt())
+
+def importNumpy():
+    "Imports NumPy when an ArrayGrid is first made, so that the other grids do not need it"
+    try:
+        import numpy
+    except ImportError:
+        raise Exception('ArrayGrid needs numpy, which is not installed')
+    return numpy
+
+class ArrayGrid:
+    """
+    A Grid of booleans backed by a NumPy bool array of shape (width, height),
+    for large layouts: count, asList, asInt and packBits are vectorized, and
+    &, | and ^ combine two grids cell by cell.  array is the ndarray itself,
+    so NumPy code can work on the cells without a copy.  grid[x] is a view of
+    column x, so grid[x][y] reads and writes as for a Grid.
+
+    Needs NumPy, which is imported when the first ArrayGrid is made;
+    freeze() and builder() work as for a Grid.
+    """
+    frozen = False
+    _hash = _count = _list = None
+
+    def __init__(self, width, height, initialValue=False, array=None):
+        numpy = importNumpy()
+        if initialValue not in [False, True]: raise Exception('Grids can only contain booleans')
+        self.width = width
+        self.height = height
+        if array is None:
+            array = numpy.full((width, height), initialValue, dtype=bool)
+        self.array = array
+
+    def __getitem__(self, x):
+        return self.array[x]
+
+    def __setitem__(self, x, column):
+        if self.frozen: raise Exception('A frozen grid can not be changed; change a builder() copy instead')
+        self.array[x] = column
+
+    def __str__(self):
+        out = [['T' if cell else 'F' for cell in row] for row in self.array.T.tolist()]
+        out.reverse()
+        return '\n'.join([''.join(x) for x in out])
+
+    def __eq__(self, other):
+        if other == None or not hasattr(other, 'asInt'): return False
+        if isinstance(other, ArrayGrid):
+            import numpy
+            return numpy.array_equal(self.array, other.array)
+        return self.width == other.width and self.height == other.height and self.asInt() == other.asInt()
+
+    def __hash__(self):
+        if self.frozen:
+            if self._hash == None:
+                self._hash = hash(self.asInt())
+            return self._hash
+        return hash(self.asInt())
+
+    def _otherArray(self, other):
+        # NumPy would broadcast a column or a single cell over the grid, so the sizes are checked first
+        if (other.width, other.height) != (self.width, self.height):
+            raise Exception('Can not combine a %dx%d grid with a %dx%d grid' % (self.width, self.height, other.width, other.height))
+        return arrayGrid(other).array
+
+    def __and__(self, other):
+        return ArrayGrid(self.width, self.height, array=self.array & self._otherArray(other))
+
+    def __or__(self, other):
+        return ArrayGrid(self.width, self.height, array=self.array | self._otherArray(other))
+
+    def __xor__(self, other):
+        return ArrayGrid(self.width, self.height, array=self.array ^ self._otherArray(other))
+
+    # the other grids have no operators, so grid & arrayGrid ends up here too
+    __rand__ = __and__
+    __ror__ = __or__
+    __rxor__ = __xor__
+
+    def __invert__(self):
+        return ArrayGrid(self.width, self.height, array=~self.array)
+
+    def freeze(self):
+        "Makes the grid (and its array) read only and returns it; from then on it remembers its hash, count and asList"
+        self.array.flags.writeable = False
+        self.frozen = True
+        return self
+
+    def builder(self):
+        "A mutable copy of the grid, to change and then freeze()"
+        return self.copy()
+
+    def withCell(self, x, y, value):
+        "Returns a frozen grid equal to this one except that cell (x, y) holds value, as Grid.withCell"
+        if self.frozen and self.array[x, y] == value:
+            return self
+        g = self.copy()
+        g.array[x, y] = value
+        return g.freeze()
+
+    def copy(self):
+        return ArrayGrid(self.width, self.height, array=self.array.copy())
+
+    def deepCopy(self):
+        return self.copy()
+
+    def shallowCopy(self):
+        return ArrayGrid(self.width, self.height, array=self.array)
+
+    def count(self, item=True):
+        import numpy
+        if self.frozen:
+            if self._count == None:
+                self._count = int(numpy.count_nonzero(self.array))
+            ones = self._count
+        else:
+            ones = int(numpy.count_nonzero(self.array))
+        return ones if item else self.width * self.height - ones
+
+    def asList(self, key=True):
+        if self.frozen and key == True:
+            if self._list == None:
+                self._list = tuple(self._cells(key))
+            return list(self._list)
+        return self._cells(key)
+
+    def _cells(self, key):
+        import numpy
+        # nonzero lists the cells in row major order, x first, like Grid.asList
+        xs, ys = numpy.nonzero(self.array if key else ~self.array)
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def asInt(self):
+        "Returns the grid as one int whose bit x * height + y is cell (x, y)"
+        import numpy
+        packed = numpy.packbits(self.array.ravel(), bitorder='little')
+        return int.from_bytes(packed.tobytes(), 'little')
+
+    def packBits(self):
+        """
+        Returns the same (width, height, bitPackedInts...) tuple as
+        Grid.packBits, built with whole-array operations
+        """
+        import numpy
+        cellsPerInt = Grid.CELLS_PER_INT
+        cells = self.array.ravel()
+        # Grid.packBits always ends with the int in progress, even when that one is empty
+        chunks = len(cells) // cellsPerInt + 1
+        padded = numpy.zeros(chunks * cellsPerInt, dtype=numpy.int64)
+        padded[:len(cells)] = cells
+        weights = numpy.left_shift(1, numpy.arange(cellsPerInt - 1, -1, -1, dtype=numpy.int64))
+        ints = padded.reshape(chunks, cellsPerInt) @ weights
+        return tuple([self.width, self.height] + ints.tolist())
+
+    def asGrid(self):
+        "The same cells as a list of lists Grid"
+        g = Grid(self.width, self.height)
+        g.data = self.array.tolist()
+        return g
+
+def arrayGrid(grid):
+    "The ArrayGrid with the same cells as grid (grid itself if it is one)"
+    if isinstance(grid, ArrayGrid):
+        return grid
+    numpy = importNumpy()
+    cells = grid.width * grid.height
+    packed = numpy.frombuffer(grid.asInt().to_bytes((cells + 7) // 8, 'little'), dtype=numpy.uint8)
+    array = numpy.unpackbits(packed, count=cells, bitorder='little').astype(bool)
+    return ArrayGrid(grid.width, grid.height, array=array.reshape(grid.width, grid.height))
+
+def gridFromInt(width, height, bits):
+    "The Grid of the given size whose cells are the bits of an int made by Grid.asInt"
+    g = Grid(width, height)
+    cells = bin(bits)[2:].zfill(width * height)[::-1]
+    g.data = [[cell == '1' for cell in cells[x * height:(x + 1) * height]] for x in range(width)]
+    return g
+
+def gridFromBytes(data, frozen=False):
+    "The Grid that Grid.toBytes turned into data, frozen if frozen is set"
+    width = int.from_bytes(data[:4], 'little')
+    height = int.from_bytes(data[4:8], 'little')
+    g = gridFromInt(width, height, int.from_bytes(data[8:], 'little'))
+    if frozen:
+        g.freeze()
+    return g
 
 def reconstituteGrid(bitRep):
+    if type(bitRep) is bytes:
+        return gridFromBytes(bitRep)
     if type(bitRep) is not type((1,2)):
         return bitRep
     width, height = bitRep[:2]
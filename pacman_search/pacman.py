@@ -361,8 +361,8 @@ class PacmanRules:
         # Eat food
         if state.data.food[x][y]:
             state.data.scoreChange += 10
-            state.data.food = state.data.food.copy()
-            state.data.food[x][y] = False
+            # the other states keep sharing the old grid, the new one shares all but column x with it
+            state.data.food = state.data.food.withCell(x, y, False)
             state.data._foodEaten = position
             # TODO: cache numFood?
             numFood = state.getNumFood()
@@ -17,6 +17,10 @@ In search.py, you will implement generic search algorithms which are called by
 Pacman agents (in searchAgents.py).
 """
 
+import heapq
+import itertools
+import queue
+import time
 import util
 
 class SearchProblem:
@@ -88,6 +92,25 @@ class SearchProblem:
         """
         util.raiseNotDefined()
 
+    def encode(self, state):
+        """
+          state: Search state
+
+        Optional.  Returns a non-negative int that identifies state, so that
+        searches can key their tables on ints instead of hashing whole
+        states; decode(encode(state)) must give back an equal state.  Returns
+        None if the problem has no encoding.
+        """
+        return None
+
+    def decode(self, code):
+        """
+          code: an int returned by encode
+
+        Returns the search state that code identifies.
+        """
+        util.raiseNotDefined()
+
 
 def tinyMazeSearch(problem):
     """
@@ -109,12 +132,244 @@ def reconstruct_path(state , parent_action_dict) :
         parent , action = parent_action_dict[parent]
     return actions[::-1]
 
+def stateCodec(problem):
+    """
+    Returns (encode, decode) for the states of problem: the problem's own
+    encode and decode if it has an encoding, otherwise the identity, so a
+    search keys its tables on encode(state) either way.
+    """
+    encode = getattr(problem, 'encode', None)
+    if encode != None and encode(problem.getStartState()) != None:
+        return problem.encode, problem.decode
+    return (lambda state: state), (lambda code: code)
+
+class SearchResult(list):
+    """
+    A list of actions that also records how the search that produced it
+    ended and what it took.  Search functions return one when called with
+    statistics=True, and whenever their budget runs out before they reach a
+    goal; the actions then lead to the most promising state reached so far
+    (the one with the lowest heuristic value, or the last state expanded for
+    uninformed searches).
+
+      reason:          'goal', 'exhausted', 'maxExpansions' or 'deadline'
+      complete:        True if the actions reach a goal state
+      expanded:        number of states the search expanded
+
+    and, when statistics were kept:
+
+      cost:            cost of the actions
+      generated:       number of children returned by expand
+      duplicates:      pushes of a state that had already been pushed
+      maxFrontier:     peak number of states waiting in the frontier
+      maxClosed:       peak number of states in the closed set
+      heuristicCalls:  number of heuristic evaluations
+      heuristicTime:   seconds spent in the heuristic
+      expandTime:      seconds spent in expand
+    """
+    def __init__(self, actions=(), expanded=0, reason='goal', complete=True):
+        list.__init__(self, actions)
+        self.expanded = expanded
+        self.reason = reason
+        self.complete = complete
+        self.cost = None
+        self.generated = self.duplicates = 0
+        self.maxFrontier = self.maxClosed = 0
+        self.heuristicCalls = 0
+        self.heuristicTime = self.expandTime = 0.0
+
+    def actions(self):
+        "The actions as a plain list"
+        return list(self)
+
+    def summary(self):
+        "A few lines describing the search, for printing"
+        lines = ['Search ended (%s) after %d expansions' % (self.reason, self.expanded)]
+        if self.cost != None:
+            lines.append('  path cost %s, %d actions%s' % (self.cost, len(self), '' if self.complete else ' (partial)'))
+            lines.append('  generated %d, duplicate pushes %d' % (self.generated, self.duplicates))
+            lines.append('  peak frontier %d, peak closed set %d' % (self.maxFrontier, self.maxClosed))
+            lines.append('  heuristic calls %d taking %.3fs, expand taking %.3fs' % (self.heuristicCalls, self.heuristicTime, self.expandTime))
+        return '\n'.join(lines)
+
+class SearchMonitor:
+    """
+    Keeps the budget and the statistics of a single search.  maxExpansions
+    caps the number of expansions and deadline the number of seconds the
+    search may run for; None leaves either one unlimited.  With statistics
+    set the monitor also counts children and heuristic calls and times
+    expand and the heuristic.
+    """
+    def __init__(self, maxExpansions=None, deadline=None, statistics=False):
+        self.maxExpansions = maxExpansions
+        self.deadline = None if deadline == None else time.time() + deadline
+        self.statistics = statistics
+        self.expanded = self.generated = self.duplicates = 0
+        self.maxFrontier = self.maxClosed = 0
+        self.heuristicCalls = 0
+        self.heuristicTime = self.expandTime = 0.0
+
+    def charge(self, frontier=0, closed=0):
+        """
+        Called before every expansion with the current sizes of the frontier
+        and of the closed set.  Returns the reason the budget has run out
+        ('maxExpansions' or 'deadline'), otherwise counts the expansion and
+        returns None.
+        """
+        if self.maxExpansions != None and self.expanded >= self.maxExpansions:
+            return 'maxExpansions'
+        if self.deadline != None and time.time() >= self.deadline:
+            return 'deadline'
+        self.expanded += 1
+        if frontier > self.maxFrontier:
+            self.maxFrontier = frontier
+        if closed > self.maxClosed:
+            self.maxClosed = closed
+        return None
+
+    def duplicate(self):
+        "Counts a push of a state that had already been pushed"
+        self.duplicates += 1
+
+    def expander(self, expand):
+        "Returns expand, wrapped to count children and time the calls if statistics are kept"
+        if not self.statistics:
+            return expand
+        def timedExpand(state):
+            started = time.perf_counter()
+            children = expand(state)
+            self.expandTime += time.perf_counter() - started
+            self.generated += len(children)
+            return children
+        return timedExpand
+
+    def timedHeuristic(self, heuristic):
+        "Returns heuristic, wrapped to count and time the calls if statistics are kept"
+        if not self.statistics:
+            return heuristic
+        def timed(state, problem):
+            started = time.perf_counter()
+            value = heuristic(state, problem)
+            self.heuristicTime += time.perf_counter() - started
+            self.heuristicCalls += 1
+            return value
+        return timed
+
+    def finish(self, actions, problem, reason='goal', complete=None):
+        """
+        Returns what a search function returns: the plain list of actions, or
+        a SearchResult if statistics are kept or the budget stopped the
+        search.  complete defaults to whether the search reached a goal.
+        """
+        if not self.statistics and reason in ('goal', 'exhausted'):
+            return actions
+        result = SearchResult(actions, self.expanded, reason, reason == 'goal' if complete == None else complete)
+        if self.statistics:
+            result.cost = problem.getCostOfActionSequence(actions)
+            result.generated, result.duplicates = self.generated, self.duplicates
+            result.maxFrontier, result.maxClosed = self.maxFrontier, self.maxClosed
+            result.heuristicCalls, result.heuristicTime = self.heuristicCalls, self.heuristicTime
+            result.expandTime = self.expandTime
+        return result
+
+#every search is written once, as a streaming search: a generator (named ...Events) that yields a SearchEvent for
+#every step instead of returning once at the end.  the search function runs its generator with steps=False, which
+#leaves out the 'expand' and 'generate' events, so the two always make the same choices
+#a caller can run a streaming search one step at a time, interleave it with other work, draw or measure it while it
+#runs, and cancel it by dropping the generator
+#the last event is always 'goal', 'budget' or 'exhausted' and carries what the search function would have returned
+#hashDistributedAStarSearch is the one search without a streaming version: its states are expanded in worker
+#processes, and sending every step back to the caller would funnel all the workers through one queue
+
+class SearchEvent:
+    """
+    One step of a streaming search.
+
+      'expand'     state is about to be expanded
+      'generate'   state was pushed into the frontier, reached from parent
+                   by action (it was new or reached more cheaply)
+      'solution'   an anytime search found a cheaper path or a tighter
+                   bound; actions is the path and it keeps searching
+      'goal'       state is a goal; actions is the path to it
+      'budget'     the budget ran out (reason); actions is the partial path
+      'exhausted'  the frontier ran dry; actions is []
+
+    cost is the path cost of state for the searches that keep one and None
+    otherwise.  On the backward side of a bidirectional search the moves
+    run the other way: parent is reached from state by action.  The actions
+    of the last event are exactly what the matching search function returns.
+    """
+    def __init__(self, kind, state=None, cost=None, parent=None, action=None, actions=None, reason=None):
+        self.kind = kind
+        self.state = state
+        self.cost = cost
+        self.parent = parent
+        self.action = action
+        self.actions = actions
+        self.reason = reason
+
+    def __repr__(self):
+        if self.actions != None:
+            return 'SearchEvent(%s, %d actions)' % (self.kind, len(self.actions))
+        return 'SearchEvent(%s, %s)' % (self.kind, self.state)
+
+def runSearchEvents(events, observer=None):
+    """
+    Runs a streaming search to the end, calling observer(event) with every
+    event if one is given, and returns the actions of the last event.
+    """
+    event = None
+    for event in events:
+        if observer != None:
+            observer(event)
+    return event.actions
+
 #in all functions i changed the early exit from what was presented in class to pass the autograder
 #all use a parent - action  dictionary to track the actions
 #astar also uses a cost dict
 
 
-def depthFirstSearch(problem):
+def depthFirstEvents(problem, maxExpansions=None, deadline=None, statistics=False, steps=True):
+    "depthFirstSearch, one event at a time"
+
+    #visited and parent are keyed on the state codes (problem.encode), the stack holds (code, state) pairs
+
+    stack = util.Stack()
+    visited = set()
+    monitor = SearchMonitor(maxExpansions, deadline, statistics)
+    expand = monitor.expander(problem.expand)
+    encode , decode = stateCodec(problem)
+    start = problem.getStartState()
+    parent = {encode(start): (None , ' ')}
+    stack.push((encode(start), start))
+
+    while not stack.isEmpty():
+        key , state = stack.pop()
+        
+        visited.add(key)
+        if problem.isGoalState(state):
+            yield SearchEvent('goal', state, actions=monitor.finish(reconstruct_path(key  , parent), problem))
+            return
+        reason = monitor.charge(len(stack.list), len(visited))
+        if reason:
+            yield SearchEvent('budget', state, actions=monitor.finish(reconstruct_path(key , parent), problem, reason), reason=reason)
+            return
+
+        if steps:
+            yield SearchEvent('expand', state)
+        for next_state , action , cost in expand(state):
+            next_key = encode(next_state)
+            if next_key not in visited : #only check for visited in dfs to change the parent
+                if next_key in parent:
+                    monitor.duplicate()
+                parent[next_key] = (key, action)
+                stack.push((next_key, next_state))
+                if steps:
+                    yield SearchEvent('generate', next_state, parent=state, action=action)
+                
+    yield SearchEvent('exhausted', actions=monitor.finish([], problem, 'exhausted'))
+
+def depthFirstSearch(problem, maxExpansions=None, deadline=None, statistics=False):
     """
     Search the deepest nodes in the search tree first.
 
@@ -128,51 +383,111 @@ def depthFirstSearch(problem):
     print("Is the start a goal?", problem.isGoalState(problem.getStartState()))
     """
     "*** YOUR CODE HERE ***"
+    return runSearchEvents(depthFirstEvents(problem, maxExpansions, deadline, statistics, steps=False))
 
-    stack = util.Stack()
-    visited = set()
-    start = problem.getStartState()
-    parent = {start: (None , ' ')}
-    stack.push(start)
-
-    while not stack.isEmpty():
-        state = stack.pop()
-        
-        visited.add(state)
-        if problem.isGoalState(state):
-            return reconstruct_path(state  , parent)
-
-        for next_state , action , cost in problem.expand(state):
-            if next_state not in visited : #only check for visited in dfs to change the parent
-                parent[next_state] = (state, action)
-                stack.push(next_state)
-                
-    return []
 
+def breadthFirstEvents(problem, maxExpansions=None, deadline=None, statistics=False, steps=True):
+    "breadthFirstSearch, one event at a time"
 
-def breadthFirstSearch(problem):
-    """Search the shallowest nodes in the search tree first."""
-    "*** YOUR CODE HERE ***"
+    #visited and parent are keyed on the state codes (problem.encode), the queue holds (code, state) pairs
 
     queue = util.Queue()
     visited = set()
+    monitor = SearchMonitor(maxExpansions, deadline, statistics)
+    expand = monitor.expander(problem.expand)
+    encode , decode = stateCodec(problem)
     start = problem.getStartState()
-    parent = {start: (None , ' ')}
-    queue.push(start)
+    parent = {encode(start): (None , ' ')}
+    queue.push((encode(start), start))
     
     while not queue.isEmpty():
-        state = queue.pop()
+        key , state = queue.pop()
         
-        visited.add(state)
+        visited.add(key)
         if problem.isGoalState(state):
-            return reconstruct_path(state , parent)
+            yield SearchEvent('goal', state, actions=monitor.finish(reconstruct_path(key , parent), problem))
+            return
+        reason = monitor.charge(len(queue.list), len(visited))
+        if reason:
+            yield SearchEvent('budget', state, actions=monitor.finish(reconstruct_path(key , parent), problem, reason), reason=reason)
+            return
 
-        for next_state , action , cost in problem.expand(state):
+        if steps:
+            yield SearchEvent('expand', state)
+        children = []
+        for next_state , action , cost in expand(state):
             #check if the next state has already been visited or if is to be visited by a faster path
-            if next_state not in visited and next_state not in parent:
-                parent[next_state] = (state, action)
-                queue.push(next_state)
-    return []
+            next_key = encode(next_state)
+            if next_key not in visited and next_key not in parent:
+                parent[next_key] = (key, action)
+                children.append((next_key, next_state))
+        queue.pushMany(children)
+        if steps:
+            for next_key , next_state in children:
+                yield SearchEvent('generate', next_state, parent=state, action=parent[next_key][1])
+    yield SearchEvent('exhausted', actions=monitor.finish([], problem, 'exhausted'))
+
+def breadthFirstSearch(problem, maxExpansions=None, deadline=None, statistics=False):
+    """Search the shallowest nodes in the search tree first."""
+    "*** YOUR CODE HERE ***"
+    return runSearchEvents(breadthFirstEvents(problem, maxExpansions, deadline, statistics, steps=False))
+
+
+def uniformCostEvents(problem, maxExpansions=None, deadline=None, statistics=False, steps=True):
+    "uniformCostSearch, one event at a time"
+
+    #the frontier is an indexed priority queue so finding a cheaper path to a queued state
+    #lowers its key in place (decrease-key) instead of leaving a stale duplicate in the heap
+    #expanded states are closed, with non negative costs their cost can not improve any more
+    #the tables and the frontier are keyed on the state codes (problem.encode), waiting maps the codes
+    #in the frontier back to their states
+
+    frontier = util.PriorityQueue()
+    expanded = set()
+    monitor = SearchMonitor(maxExpansions, deadline, statistics)
+    expand = monitor.expander(problem.expand)
+    encode , decode = stateCodec(problem)
+    start = problem.getStartState()
+    parent = {encode(start): (None , ' ')}
+    cost = {encode(start): 0}
+    waiting = {encode(start): start}
+    frontier.push(encode(start), 0)
+
+    while not frontier.isEmpty():
+        key = frontier.pop()
+        state = waiting.pop(key)
+
+        if problem.isGoalState(state):
+            yield SearchEvent('goal', state, cost[key], actions=monitor.finish(reconstruct_path(key , parent), problem))
+            return
+        reason = monitor.charge(len(frontier), len(expanded))
+        if reason:
+            yield SearchEvent('budget', state, cost[key], actions=monitor.finish(reconstruct_path(key , parent), problem, reason), reason=reason)
+            return
+        expanded.add(key)
+
+        if steps:
+            yield SearchEvent('expand', state, cost[key])
+        for next_state , action , step_cost in expand(state):
+            next_key = encode(next_state)
+            if next_key in expanded:
+                continue
+            total = cost[key] + step_cost
+            if next_key not in cost or total < cost[next_key]:
+                if next_key in cost:
+                    monitor.duplicate()
+                cost[next_key] = total
+                parent[next_key] = (key, action)
+                waiting[next_key] = next_state
+                frontier.update(next_key, total)
+                if steps:
+                    yield SearchEvent('generate', next_state, total, state, action)
+
+    yield SearchEvent('exhausted', actions=monitor.finish([], problem, 'exhausted'))
+
+def uniformCostSearch(problem, maxExpansions=None, deadline=None, statistics=False):
+    """Search the node of least total cost first."""
+    return runSearchEvents(uniformCostEvents(problem, maxExpansions, deadline, statistics, steps=False))
 
 
 def nullHeuristic(state, problem=None):
@@ -182,39 +497,1631 @@ def nullHeuristic(state, problem=None):
     """
     return 0
 
-def aStarSearch(problem, heuristic=nullHeuristic):
-    """Search the node that has the lowest combined cost and heuristic first."""
-    "*** YOUR CODE HERE ***"
+#tie breaking: among frontier states of equal priority the queue pops the one pushed first (fifo)
+#'g' prefers the state with the higher path cost, 'h' the one with the lower heuristic and 'lifo' the one pushed last
+#for A* (f = g + h) 'g' and 'h' order the states the same way; both dive towards the goal along one of the
+#equally good paths instead of widening the whole f layer, which is where most of the expansions of a good
+#heuristic are saved.  remaining ties are still broken fifo
+
+TIE_BREAKS = ('fifo', 'lifo', 'g', 'h')
+
+def tieBreakPriority(tiebreak):
+    """
+    Returns priority(f, g, h), the frontier priority of a state with
+    evaluation f, path cost g and heuristic value h under tiebreak (one of
+    TIE_BREAKS).
+    """
+    if tiebreak == 'fifo':
+        return lambda f, g, h: f
+    if tiebreak == 'g':
+        return lambda f, g, h: (f, -g)
+    if tiebreak == 'h':
+        return lambda f, g, h: (f, h)
+    if tiebreak == 'lifo':
+        pushes = itertools.count()
+        return lambda f, g, h: (f, -next(pushes))
+    raise Exception('Unknown tie break %s; choose from %s' % (tiebreak, ', '.join(TIE_BREAKS)))
 
+def aStarEvents(problem, heuristic=nullHeuristic, maxExpansions=None, deadline=None, statistics=False, tiebreak='fifo', steps=True):
+    "aStarSearch, one event at a time"
 
     #cost dict holds the actual costs
     #A state is pushed in the frontier if it hasen't been discovered yet (not in cost dict) or if its cost is less than the one already in the cost dict
     #(i decided to use the actual cost g here other than g+h after doing several tests and reading articles on A* performance and 
     #found that this way i save a lot of calculations while my results are still correct thus increasing performance)
+    #a state that is still in the frontier gets its key lowered in place (update is a decrease-key), so the frontier never
+    #holds duplicate entries and a state is never expanded twice through a stale entry
     
+    #if the budget runs out the partial path leads to the state with the lowest h generated so far
+
+    #pacman problems have small integer step costs and integer heuristics so the frontier is a bucket queue
+    #whenever the start heuristic is integral (the bucket queue is still correct if a fractional priority shows up later)
+
+    #the tables and the frontier are keyed on the state codes (problem.encode) like in ucs
+
+    #ties of f are broken by tiebreak (see tieBreakPriority), lifo gives every push its own priority so it skips the bucket queue
+
+    monitor = SearchMonitor(maxExpansions, deadline, statistics)
+    expand = monitor.expander(problem.expand)
+    heuristic = monitor.timedHeuristic(heuristic)
+    priority = tieBreakPriority(tiebreak)
+    encode , decode = stateCodec(problem)
+    start = problem.getStartState()
+    start_h = heuristic(start , problem)
+    frontier = util.BucketPriorityQueue() if util.isIntegral(start_h) and tiebreak != 'lifo' else util.PriorityQueue()
+    parent_action = {encode(start) : (None , ' ')}
+    cost = {encode(start) : 0}
+    waiting = {encode(start) : start}
+    frontier.push(encode(start)  , priority(0 + start_h , 0 , start_h))
+    best_h , best_key = start_h , encode(start)
+
+    while not frontier.isEmpty():
+        key = frontier.pop()
+        state = waiting.pop(key)
+
+        if problem.isGoalState(state):
+            yield SearchEvent('goal', state, cost[key], actions=monitor.finish(reconstruct_path(key , parent_action), problem))
+            return
+        #every reached state that is not in the frontier has been expanded
+        reason = monitor.charge(len(frontier), len(cost) - len(frontier))
+        if reason:
+            yield SearchEvent('budget', state, cost[key], actions=monitor.finish(reconstruct_path(best_key , parent_action), problem, reason), reason=reason)
+            return
+            
+        if steps:
+            yield SearchEvent('expand', state, cost[key])
+        for next_state , action , new_cost in expand(state):
+            next_key = encode(next_state)
+            total = cost[key] + new_cost
+            if next_key not in cost or cost[next_key] > total: 
+                if next_key in cost:
+                    monitor.duplicate()
+                cost[next_key] = total
+                h = heuristic(next_state , problem)
+                waiting[next_key] = next_state
+                frontier.update(next_key , priority(total  + h , total , h))
+                parent_action[next_key] = (key , action)
+                if h < best_h:
+                    best_h , best_key = h , next_key
+                if steps:
+                    yield SearchEvent('generate', next_state, total, state, action)
+
+    yield SearchEvent('exhausted', actions=monitor.finish([], problem, 'exhausted'))
+
+def aStarSearch(problem, heuristic=nullHeuristic, maxExpansions=None, deadline=None, statistics=False, tiebreak='fifo'):
+    """Search the node that has the lowest combined cost and heuristic first."""
+    "*** YOUR CODE HERE ***"
+    return runSearchEvents(aStarEvents(problem, heuristic, maxExpansions, deadline, statistics, tiebreak, steps=False))
+
+
+def weightedAStarEvents(problem, heuristic=nullHeuristic, weight=2, maxExpansions=None, deadline=None, statistics=False, tiebreak='fifo', steps=True):
+    "weightedAStarSearch, one event at a time"
+    return aStarEvents(problem, lambda state, problem: weight * heuristic(state , problem), maxExpansions, deadline, statistics, tiebreak, steps)
+
+def weightedAStarSearch(problem, heuristic=nullHeuristic, weight=2, maxExpansions=None, deadline=None, statistics=False, tiebreak='fifo'):
+    """
+    A* on f = g + weight * h.  Inflating an admissible heuristic by weight
+    finds a path of at most weight times the optimal cost while expanding
+    far fewer nodes.
+    """
+    return runSearchEvents(weightedAStarEvents(problem, heuristic, weight, maxExpansions, deadline, statistics, tiebreak, steps=False))
+
+def greedyBestFirstEvents(problem, heuristic=nullHeuristic, maxExpansions=None, deadline=None, statistics=False, tiebreak='fifo', steps=True):
+    "greedyBestFirstSearch, one event at a time"
+
+    #a graph search: a state keeps the first path that reached it and is expanded at most once
+    #if the budget runs out the partial path leads to the state with the lowest h generated so far, like astar
+
+    monitor = SearchMonitor(maxExpansions, deadline, statistics)
+    expand = monitor.expander(problem.expand)
+    heuristic = monitor.timedHeuristic(heuristic)
+    priority = tieBreakPriority(tiebreak)
+    encode , decode = stateCodec(problem)
+    start = problem.getStartState()
+    start_h = heuristic(start , problem)
+    frontier = util.BucketPriorityQueue() if util.isIntegral(start_h) and tiebreak != 'lifo' else util.PriorityQueue()
+    parent_action = {encode(start) : (None , ' ')}
+    cost = {encode(start) : 0}
+    waiting = {encode(start) : start}
+    frontier.push(encode(start) , priority(start_h , 0 , start_h))
+    best_h , best_key = start_h , encode(start)
+
+    while not frontier.isEmpty():
+        key = frontier.pop()
+        state = waiting.pop(key)
+
+        if problem.isGoalState(state):
+            yield SearchEvent('goal', state, cost[key], actions=monitor.finish(reconstruct_path(key , parent_action), problem))
+            return
+        reason = monitor.charge(len(frontier), len(cost) - len(frontier))
+        if reason:
+            yield SearchEvent('budget', state, cost[key], actions=monitor.finish(reconstruct_path(best_key , parent_action), problem, reason), reason=reason)
+            return
+
+        if steps:
+            yield SearchEvent('expand', state, cost[key])
+        for next_state , action , step_cost in expand(state):
+            next_key = encode(next_state)
+            if next_key in cost:
+                monitor.duplicate()
+                continue
+            total = cost[key] + step_cost
+            h = heuristic(next_state , problem)
+            cost[next_key] = total
+            parent_action[next_key] = (key , action)
+            waiting[next_key] = next_state
+            frontier.push(next_key , priority(h , total , h))
+            if h < best_h:
+                best_h , best_key = h , next_key
+            if steps:
+                yield SearchEvent('generate', next_state, total, state, action)
+
+    yield SearchEvent('exhausted', actions=monitor.finish([], problem, 'exhausted'))
+
+def greedyBestFirstSearch(problem, heuristic=nullHeuristic, maxExpansions=None, deadline=None, statistics=False, tiebreak='fifo'):
+    """
+    Search the node that looks closest to a goal (lowest heuristic) first,
+    ignoring the cost of the path so far.  Fast with a good heuristic but
+    the path is not optimal.  tiebreak orders states of equal h as in
+    aStarSearch ('h' has nothing left to break there and acts like fifo).
+    """
+    return runSearchEvents(greedyBestFirstEvents(problem, heuristic, maxExpansions, deadline, statistics, tiebreak, steps=False))
+
+def printSolutionBound(actions, cost, bound):
+    print('[ARA*] path of cost %s found, at most %.3f times the optimal cost' % (cost, bound))
+
+def anytimeRepairingEvents(problem, heuristic=nullHeuristic, weight=3, decrement=0.5, maxExpansions=None, deadline=None, statistics=False, report=printSolutionBound, steps=True):
+    "anytimeRepairingAStar, one event at a time; every report also yields a 'solution' event"
+    monitor = SearchMonitor(maxExpansions, deadline, statistics)
+    expand = monitor.expander(problem.expand)
+    heuristic = monitor.timedHeuristic(heuristic)
+
+    #h values are cached since every weight change re-keys the whole open list
+    #inconsistent holds closed states whose g improved during this pass, they are reopened when the weight drops
+
+    h = {}
+    def h_value(state):
+        if state not in h:
+            h[state] = heuristic(state , problem)
+        return h[state]
+
+    start = problem.getStartState()
+    cost = {start: 0}
+    parent = {start: (None , ' ')}
+    goal , goal_cost = None , float('inf')
+    if problem.isGoalState(start):
+        goal , goal_cost = start , 0
+
     frontier = util.PriorityQueue()
+    frontier.push(start , weight * h_value(start))
+    closed , inconsistent = set(), set()
+    best_path , best_bound = None , weight
+    best_h_state = start
+
+    def finish(actions , reason='goal', complete=None):
+        result = monitor.finish(actions , problem , reason , complete)
+        if isinstance(result , SearchResult):
+            result.bound = best_bound
+        return result
+
+    while True:
+        #improve path: weighted A* until no open state can lead to a cheaper goal under the current weight
+        while not frontier.isEmpty() and goal_cost > frontier.peekPriority():
+            reason = monitor.charge(len(frontier), len(closed))
+            if reason and best_path == None:
+                yield SearchEvent('budget', best_h_state, cost[best_h_state], actions=finish(reconstruct_path(best_h_state , parent), reason), reason=reason)
+                return
+            if reason:
+                yield SearchEvent('budget', goal, best_cost, actions=finish(best_path , reason , complete=True), reason=reason)
+                return
+            state = frontier.pop()
+            closed.add(state)
+            if steps:
+                yield SearchEvent('expand', state, cost[state])
+            for next_state , action , step_cost in expand(state):
+                total = cost[state] + step_cost
+                if next_state in cost and cost[next_state] <= total:
+                    continue
+                if next_state in cost:
+                    monitor.duplicate()
+                cost[next_state] = total
+                parent[next_state] = (state , action)
+                if next_state in closed:
+                    inconsistent.add(next_state)
+                else:
+                    frontier.push(next_state , total + weight * h_value(next_state))
+                if h_value(next_state) < h_value(best_h_state):
+                    best_h_state = next_state
+                if total < goal_cost and problem.isGoalState(next_state):
+                    goal , goal_cost = next_state , total
+                if steps:
+                    yield SearchEvent('generate', next_state, total, state, action)
+
+        if goal == None:
+            yield SearchEvent('exhausted', actions=finish([], 'exhausted'))
+            return
+
+        pending = [state for state in frontier.index] + list(inconsistent)
+        lower = min([cost[state] + h_value(state) for state in pending] or [goal_cost])
+        bound = min(weight , goal_cost / lower) if lower > 0 else 1
+        bound = max(bound , 1)
+        #report every cheaper path and every tighter bound on the current one
+        if best_path == None or goal_cost < best_cost or bound < best_bound:
+            best_path , best_cost , best_bound = reconstruct_path(goal , parent), goal_cost , bound
+            if report != None:
+                report(best_path , best_cost , bound)
+            if steps:
+                yield SearchEvent('solution', goal, goal_cost, actions=list(best_path))
+
+        if bound <= 1:
+            yield SearchEvent('goal', goal, goal_cost, actions=finish(best_path))
+            return
+
+        #lower the weight, move the inconsistent states back to the open list and re-key it
+        weight = max(1 , weight - decrement)
+        rebuilt = util.PriorityQueue()
+        for state in pending:
+            rebuilt.push(state , cost[state] + weight * h_value(state))
+        frontier = rebuilt
+        closed , inconsistent = set(), set()
+
+def anytimeRepairingAStar(problem, heuristic=nullHeuristic, weight=3, decrement=0.5, maxExpansions=None, deadline=None, statistics=False, report=printSolutionBound):
+    """
+    Anytime Repairing A* (ARA*).  Finds a path with weighted A* (f = g +
+    weight * h) first, then keeps lowering the weight by decrement and
+    repairing the search, reusing the work already done, until the path is
+    proven optimal or the budget (maxExpansions, deadline) runs out.
+    Returns the best path found; a budget stop before the first path gives
+    a partial SearchResult like the other searches.
+
+    report(actions, cost, bound) is called with every cheaper path or
+    tighter bound, where bound is the proven factor by which cost can exceed
+    the optimal cost: the smaller of the current weight and cost / min(g +
+    h) over the states that can still improve a path.  A SearchResult
+    returned by this search also carries the last bound as 'bound'.
+    """
+    return runSearchEvents(anytimeRepairingEvents(problem, heuristic, weight, decrement, maxExpansions, deadline, statistics, report, steps=False))
+
+
+#beam searches trade path quality for time and memory: width states survive each step and the rest are forgotten
+#with evaluation='h' they behave like greedy search, with 'g+h' like A*, and the wider the beam the closer the
+#path gets to what the unbounded search would return
+
+def searchEvaluation(evaluation):
+    #returns f(g, h) for the evaluation name
+    if evaluation == 'h':
+        return lambda g , h: h
+    if evaluation == 'g+h':
+        return lambda g , h: g + h
+    raise Exception("Unknown evaluation %s; choose 'h' or 'g+h'" % str(evaluation))
+
+def beamEvents(problem, heuristic=nullHeuristic, width=100, evaluation='h', maxExpansions=None, deadline=None, statistics=False, steps=True):
+    "beamSearch, one event at a time; a child is generated when it makes it into the next layer"
+    value = searchEvaluation(evaluation)
+    monitor = SearchMonitor(maxExpansions, deadline, statistics)
+    expand = monitor.expander(problem.expand)
+    heuristic = monitor.timedHeuristic(heuristic)
     start = problem.getStartState()
     parent_action = {start : (None , ' ')}
     cost = {start : 0}
-    frontier.push(start  , 0 + heuristic(start , problem))
+    beam = [start]
+    best_h , best_state = heuristic(start , problem) , start
+
+    while beam:
+        goals = [state for state in beam if problem.isGoalState(state)]
+        if goals:
+            goal = min(goals , key=cost.get)
+            yield SearchEvent('goal', goal, cost[goal], actions=monitor.finish(reconstruct_path(goal , parent_action), problem))
+            return
+
+        #the cheapest way into every child of the layer, children kept in an earlier layer are skipped
+        candidates = {}
+        for state in beam:
+            reason = monitor.charge(len(beam), len(parent_action))
+            if reason:
+                yield SearchEvent('budget', state, cost[state], actions=monitor.finish(reconstruct_path(best_state , parent_action), problem, reason), reason=reason)
+                return
+            if steps:
+                yield SearchEvent('expand', state, cost[state])
+            for next_state , action , step_cost in expand(state):
+                if next_state in parent_action:
+                    monitor.duplicate()
+                    continue
+                total = cost[state] + step_cost
+                if next_state not in candidates or candidates[next_state][0] > total:
+                    candidates[next_state] = (total , state , action)
+
+        ranked = []
+        for next_state , (total , state , action) in candidates.items():
+            h = heuristic(next_state , problem)
+            ranked.append((value(total , h), len(ranked), next_state , h))
+        ranked.sort()
+        beam = []
+        for priority , order , next_state , h in ranked[:width]:
+            total , state , action = candidates[next_state]
+            cost[next_state] = total
+            parent_action[next_state] = (state , action)
+            beam.append(next_state)
+            if h < best_h:
+                best_h , best_state = h , next_state
+            if steps:
+                yield SearchEvent('generate', next_state, total, state, action)
+
+    yield SearchEvent('exhausted', actions=monitor.finish([], problem, 'exhausted'))
+
+def beamSearch(problem, heuristic=nullHeuristic, width=100, evaluation='h', maxExpansions=None, deadline=None, statistics=False):
+    """
+    Breadth first beam search.  Expands the whole beam one layer at a time
+    and keeps only the 'width' children with the best evaluation, 'h' or
+    'g+h', for the next layer; states kept once are never kept again.  When
+    a layer holds goal states the cheapest one is returned.  Not complete:
+    if the beam runs dry before a goal the search ends 'exhausted' with
+    no path.
+    """
+    return runSearchEvents(beamEvents(problem, heuristic, width, evaluation, maxExpansions, deadline, statistics, steps=False))
+
+def boundedBestFirstEvents(problem, heuristic=nullHeuristic, width=1000, evaluation='g+h', maxExpansions=None, deadline=None, statistics=False, steps=True):
+    "boundedBestFirstSearch, one event at a time"
+
+    #trimming in batches keeps the cost of finding the worst states low, a dropped state is forgotten
+    #and can be reached again later through a cheaper path
+
+    value = searchEvaluation(evaluation)
+    monitor = SearchMonitor(maxExpansions, deadline, statistics)
+    expand = monitor.expander(problem.expand)
+    heuristic = monitor.timedHeuristic(heuristic)
+    start = problem.getStartState()
+    start_h = heuristic(start , problem)
+    frontier = util.BucketPriorityQueue() if util.isIntegral(start_h) else util.PriorityQueue()
+    parent_action = {start : (None , ' ')}
+    cost = {start : 0}
+    priority = {start : value(0 , start_h)}
+    frontier.push(start , priority[start])
+    closed = set()
+    best_h , best_state = start_h , start
 
     while not frontier.isEmpty():
         state = frontier.pop()
+        del priority[state]
 
         if problem.isGoalState(state):
-            return reconstruct_path(state , parent_action)
-            
-        for next_state , action , new_cost in problem.expand(state):
-            total = cost[state] + new_cost
-            if next_state not in cost or cost[next_state] > total: 
+            yield SearchEvent('goal', state, cost[state], actions=monitor.finish(reconstruct_path(state , parent_action), problem))
+            return
+        reason = monitor.charge(len(frontier), len(closed))
+        if reason:
+            yield SearchEvent('budget', state, cost[state], actions=monitor.finish(reconstruct_path(best_state , parent_action), problem, reason), reason=reason)
+            return
+        closed.add(state)
+
+        if steps:
+            yield SearchEvent('expand', state, cost[state])
+        for next_state , action , step_cost in expand(state):
+            total = cost[state] + step_cost
+            if next_state not in cost or cost[next_state] > total:
+                if next_state in cost:
+                    monitor.duplicate()
+                closed.discard(next_state)
                 cost[next_state] = total
-                frontier.push(next_state , total  + heuristic(next_state , problem) )
+                h = heuristic(next_state , problem)
                 parent_action[next_state] = (state , action)
+                if next_state not in priority or value(total , h) < priority[next_state]:
+                    priority[next_state] = value(total , h)
+                    frontier.push(next_state , priority[next_state])
+                    if steps:
+                        yield SearchEvent('generate', next_state, total, state, action)
+                if h < best_h:
+                    best_h , best_state = h , next_state
+
+        if len(frontier) > 2 * width:
+            for dropped in sorted(priority , key=priority.get)[width:]:
+                frontier.remove(dropped)
+                del priority[dropped]
+                del cost[dropped]
+
+    yield SearchEvent('exhausted', actions=monitor.finish([], problem, 'exhausted'))
+
+def boundedBestFirstSearch(problem, heuristic=nullHeuristic, width=1000, evaluation='g+h', maxExpansions=None, deadline=None, statistics=False):
+    """
+    Best first search whose frontier never holds more than 'width' states:
+    once it grows past twice the width the worst states by evaluation ('h'
+    or 'g+h') are dropped down to the width.  With 'g+h' and a frontier
+    that is never trimmed this is aStarSearch.  Not complete: if every
+    state is expanded or dropped before a goal the search ends 'exhausted'
+    with no path.
+    """
+    return runSearchEvents(boundedBestFirstEvents(problem, heuristic, width, evaluation, maxExpansions, deadline, statistics, steps=False))
+
+#simplified memory-bounded A* (SMA*) is a tree search that keeps at most maxNodes nodes in memory
+#a node is expanded one child at a time and stays open until all of its children are in memory
+#when memory is full the worst leaf (highest f, shallowest) is forgotten and its parent remembers the leaf's f,
+#so the parent's backed-up f stays a lower bound and the leaf is regenerated when that bound is the best again
+#a child whose state is already in memory through a path at least as cheap is not kept, which keeps open areas
+#from filling the memory with copies of the same states
+
+class MemoryNode:
+    "A node of the SMA* search tree"
+    def __init__(self, state, g, f, parent=None, action=None, index=None):
+        self.state , self.g , self.f = state , g , f
+        self.parent , self.action , self.index = parent , action , index
+        self.depth = 0 if parent == None else parent.depth + 1
+        self.successors = None
+        self.generated = 0
+        self.children , self.forgotten = {}, {}
+
+    def path(self):
+        actions , node = [], self
+        while node.parent != None:
+            actions.append(node.action)
+            node = node.parent
+        return actions[::-1]
+
+def memoryBoundedEvents(problem, heuristic=nullHeuristic, maxNodes=10000, maxExpansions=None, deadline=None, statistics=False, steps=True):
+    "memoryBoundedAStar, one event at a time"
+    monitor = SearchMonitor(maxExpansions, deadline, statistics)
+    expand = monitor.expander(problem.expand)
+    heuristic = monitor.timedHeuristic(heuristic)
+    start = problem.getStartState()
+    root = MemoryNode(start , 0 , heuristic(start , problem))
+    best_h , best_node = root.f , root
+    #open nodes by lowest f then deepest, leaves by highest f then shallowest
+    frontier , leaves = util.PriorityQueue(), util.PriorityQueue()
+    frontier.push(root , (root.f , -root.depth))
+    memory = {start : root}
+    nodes = 1
+
+    def backup(node):
+        #once every child has been generated a node is worth the best of its children
+        while node != None and node.successors != None and node.generated == len(node.successors):
+            values = [child.f for child in node.children.values()] + list(node.forgotten.values())
+            f = min(values) if values else float('inf')
+            if f == node.f:
+                return
+            node.f = f
+            if node in frontier:
+                frontier.push(node , (f , -node.depth))
+            if node in leaves:
+                leaves.push(node , (-f , node.depth))
+            node = node.parent
+
+    while not frontier.isEmpty():
+        node = frontier.pop()
+        if node.f == float('inf'):
+            break
+        if problem.isGoalState(node.state):
+            yield SearchEvent('goal', node.state, node.g, actions=monitor.finish(node.path(), problem))
+            return
+        reason = monitor.charge(len(frontier) + 1, nodes)
+        if reason:
+            yield SearchEvent('budget', node.state, node.g, actions=monitor.finish(best_node.path(), problem, reason), reason=reason)
+            return
+        if steps:
+            yield SearchEvent('expand', node.state, node.g)
+
+        if node.successors == None:
+            ancestors , ancestor = set(), node
+            while ancestor != None:
+                ancestors.add(ancestor.state)
+                ancestor = ancestor.parent
+            node.successors = [child for child in expand(node.state) if child[0] not in ancestors]
+        if node.generated < len(node.successors):
+            index = node.generated
+            node.generated += 1
+            next_state , action , step_cost = node.successors[index]
+            h = heuristic(next_state , problem)
+            f = max(node.f , node.g + step_cost + h)
+        elif node.forgotten:
+            #the forgotten child with the lowest f comes back with the f it had backed up
+            index = min(node.forgotten , key=node.forgotten.get)
+            f = node.forgotten.pop(index)
+            next_state , action , step_cost = node.successors[index]
+            h = None
+        else:
+            #a dead end, it keeps f = inf until it is forgotten
+            backup(node)
+            continue
+
+        known = memory.get(next_state)
+        if known != None and known.g <= node.g + step_cost:
+            #a copy of the state at least as cheap is in memory, this one is dropped for good
+            monitor.duplicate()
+            if node.generated < len(node.successors) or node.forgotten:
+                frontier.push(node , (node.f , -node.depth))
+            backup(node)
+            continue
+
+        child = MemoryNode(next_state , node.g + step_cost , f , node , action , index)
+        memory[next_state] = child
+        if h != None and h < best_h:
+            best_h , best_node = h , child
+        if child.depth >= maxNodes - 1 and not problem.isGoalState(next_state):
+            #a path this deep cannot be extended without forgetting its own start
+            child.f = float('inf')
+        node.children[index] = child
+        nodes += 1
+        if node in leaves:
+            leaves.remove(node)
+        if node.generated < len(node.successors) or node.forgotten:
+            frontier.push(node , (node.f , -node.depth))
+        frontier.push(child , (child.f , -child.depth))
+        leaves.push(child , (-child.f , child.depth))
+        backup(node)
+        if steps:
+            yield SearchEvent('generate', next_state, child.g, node.state, action)
+
+        while nodes > maxNodes:
+            worst = leaves.pop()
+            if worst == child and not leaves.isEmpty():
+                #never forget the child that was just generated while there is another leaf
+                worst = leaves.pop()
+                leaves.push(child , (-child.f , child.depth))
+            parent = worst.parent
+            if memory.get(worst.state) == worst:
+                del memory[worst.state]
+            if worst in frontier:
+                frontier.remove(worst)
+            del parent.children[worst.index]
+            parent.forgotten[worst.index] = worst.f
+            nodes -= 1
+            if not parent.children and parent.parent != None:
+                leaves.push(parent , (-parent.f , parent.depth))
+            frontier.push(parent , (parent.f , -parent.depth))
+
+    yield SearchEvent('exhausted', actions=monitor.finish([], problem, 'exhausted'))
+
+def memoryBoundedAStar(problem, heuristic=nullHeuristic, maxNodes=10000, maxExpansions=None, deadline=None, statistics=False):
+    """
+    Simplified memory-bounded A* (SMA*).  Never holds more than maxNodes
+    search nodes, whatever the heuristic, by forgetting the worst leaves
+    and backing their f up to their parents.  Returns an optimal path for
+    an admissible heuristic if one fits in memory (its length is below
+    maxNodes), otherwise the best path that does.  Ends 'exhausted' with
+    no path when no goal can be reached within the memory.
+    """
+    return runSearchEvents(memoryBoundedEvents(problem, heuristic, maxNodes, maxExpansions, deadline, statistics, steps=False))
+
+def iterativeDeepeningEvents(problem, heuristic=nullHeuristic, transpositionTable=0, maxExpansions=None, deadline=None, statistics=False, steps=True):
+    "iterativeDeepeningAStar, one event at a time; a state is expanded again in every iteration that reaches it"
+
+    #the depth first search is iterative, the stack holds an iterator over the children of every state on the current path
+    #states on the current path are skipped to avoid cycles, that is the only cycle check without a transposition table
+    #the frontier statistic is the depth of the current path and the closed set is the transposition table
+
+    monitor = SearchMonitor(maxExpansions, deadline, statistics)
+    expand = monitor.expander(problem.expand)
+    heuristic = monitor.timedHeuristic(heuristic)
+    start = problem.getStartState()
+    if problem.isGoalState(start):
+        yield SearchEvent('goal', start, 0, actions=monitor.finish([], problem))
+        return
+    bound = heuristic(start , problem)
+    best_h , best_actions = bound , []
+
+    while True:
+        exceeded = float('inf')
+        table = {start: 0} if transpositionTable else None
+        path , actions , costs = [start], [], [0]
+        on_path = {start}
+        reason = monitor.charge(1, len(table) if table != None else 0)
+        if reason:
+            yield SearchEvent('budget', start, 0, actions=monitor.finish(best_actions , problem , reason), reason=reason)
+            return
+        if steps:
+            yield SearchEvent('expand', start, 0)
+        stack = [iter(expand(start))]
+
+        while stack:
+            try:
+                child , action , step_cost = next(stack[-1])
+            except StopIteration:
+                stack.pop()
+                on_path.discard(path.pop())
+                costs.pop()
+                if actions:
+                    actions.pop()
+                continue
+            if child in on_path:
+                continue
+            total = costs[-1] + step_cost
+            h = heuristic(child , problem)
+            f = total + h
+            if f > bound:
+                exceeded = min(exceeded , f)
+                continue
+            if table != None:
+                if child in table and table[child] <= total:
+                    continue
+                if child in table:
+                    monitor.duplicate()
+                if len(table) < transpositionTable or child in table:
+                    table[child] = total
+            if steps:
+                yield SearchEvent('generate', child, total, path[-1], action)
+            if problem.isGoalState(child):
+                yield SearchEvent('goal', child, total, actions=monitor.finish(actions + [action], problem))
+                return
+            if h < best_h:
+                best_h , best_actions = h , actions + [action]
+            reason = monitor.charge(len(path) + 1, len(table) if table != None else 0)
+            if reason:
+                yield SearchEvent('budget', child, total, actions=monitor.finish(best_actions , problem , reason), reason=reason)
+                return
+            if steps:
+                yield SearchEvent('expand', child, total)
+            path.append(child)
+            actions.append(action)
+            costs.append(total)
+            on_path.add(child)
+            stack.append(iter(expand(child)))
+
+        if exceeded == float('inf'):
+            yield SearchEvent('exhausted', actions=monitor.finish([], problem, 'exhausted'))
+            return
+        bound = exceeded
+
+def iterativeDeepeningAStar(problem, heuristic=nullHeuristic, transpositionTable=0, maxExpansions=None, deadline=None, statistics=False):
+    """
+    Iterative-deepening A* (IDA*).  Runs depth first searches bounded by
+    f = g + h, raising the bound each time to the smallest f that exceeded
+    it, so memory stays linear in the depth of the solution instead of
+    growing with every state reached.  Optimal for an admissible heuristic.
+
+    transpositionTable is the number of states whose best g in the current
+    iteration is remembered to prune transpositions; 0 (the default) keeps
+    nothing and memory strictly linear.
+    """
+    return runSearchEvents(iterativeDeepeningEvents(problem, heuristic, transpositionTable, maxExpansions, deadline, statistics, steps=False))
+
+
+#jump point search on a 4-connected grid of unit cost moves, read straight from problem.walls
+#a horizontal jump stops where a wall ends beside it (a forced neighbour), a vertical jump also stops wherever a
+#horizontal jump from it would find a jump point, so only the ends of straight segments ever enter the frontier
+#every segment is one straight move, so the actions are rebuilt by walking the segments between the jump points
+
+def jumpPointEvents(problem, goal=None, maxExpansions=None, deadline=None, statistics=False, steps=True):
+    "jumpPointSearch, one event at a time; the states of the events are jump points, generated without an action"
+    from game import Actions
+    walls = problem.walls
+    if goal == None:
+        goal = problem.goal
+
+    def passable(x , y):
+        return 0 <= x < walls.width and 0 <= y < walls.height and not walls[x][y]
+
+    def jump(x , y , dx , dy):
+        #the first jump point met walking from (x - dx, y - dy) in direction (dx, dy), or None at a wall
+        while passable(x , y):
+            if (x , y) == goal:
+                return (x , y)
+            if dx != 0:
+                if (passable(x , y - 1) and not passable(x - dx , y - 1)) or (passable(x , y + 1) and not passable(x - dx , y + 1)):
+                    return (x , y)
+            else:
+                if (passable(x - 1 , y) and not passable(x - 1 , y - dy)) or (passable(x + 1 , y) and not passable(x + 1 , y - dy)):
+                    return (x , y)
+                if jump(x + 1 , y , 1 , 0) != None or jump(x - 1 , y , -1 , 0) != None:
+                    return (x , y)
+            x , y = x + dx , y + dy
+        return None
+
+    def successors(state):
+        #every direction but the way back, all four from the start
+        x , y = state
+        previous = parent[state]
+        directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+        if previous != None:
+            dx , dy = (x > previous[0]) - (x < previous[0]) , (y > previous[1]) - (y < previous[1])
+            directions = [direction for direction in directions if direction != (-dx , -dy)]
+        children = []
+        for dx , dy in directions:
+            point = jump(x + dx , y + dy , dx , dy)
+            if point != None:
+                children.append((point , abs(point[0] - x) + abs(point[1] - y)))
+        return children
+
+    def distance(state):
+        return abs(state[0] - goal[0]) + abs(state[1] - goal[1])
+
+    def segments(state):
+        #the jump points back to the start, then every straight segment between them unrolled into moves
+        points = [state]
+        while parent[points[-1]] != None:
+            points.append(parent[points[-1]])
+        points.reverse()
+        actions = []
+        for (x1 , y1), (x2 , y2) in zip(points , points[1:]):
+            vector = ((x2 > x1) - (x2 < x1) , (y2 > y1) - (y2 < y1))
+            actions.extend([Actions.vectorToDirection(vector)] * (abs(x2 - x1) + abs(y2 - y1)))
+        return actions
+
+    monitor = SearchMonitor(maxExpansions, deadline, statistics)
+    expand = monitor.expander(successors)
+    start = problem.getStartState()
+    frontier = util.BucketPriorityQueue()
+    parent = {start : None}
+    cost = {start : 0}
+    frontier.push(start , distance(start))
+    best_h , best_state = distance(start) , start
+    expanded = 0
+
+    try:
+        while not frontier.isEmpty():
+            state = frontier.pop()
+            if state == goal:
+                problem.isGoalState(state)
+                yield SearchEvent('goal', state, cost[state], actions=monitor.finish(segments(state), problem))
+                return
+            reason = monitor.charge(len(frontier), len(cost) - len(frontier))
+            if reason:
+                yield SearchEvent('budget', state, cost[state], actions=monitor.finish(segments(best_state), problem, reason), reason=reason)
+                return
+            expanded += 1
+            if steps:
+                yield SearchEvent('expand', state, cost[state])
+            for point , step in expand(state):
+                total = cost[state] + step
+                if point not in cost or cost[point] > total:
+                    if point in cost:
+                        monitor.duplicate()
+                    cost[point] = total
+                    parent[point] = state
+                    frontier.update(point , total + distance(point))
+                    if distance(point) < best_h:
+                        best_h , best_state = distance(point) , point
+                    if steps:
+                        yield SearchEvent('generate', point, total, state)
+
+        yield SearchEvent('exhausted', actions=monitor.finish([], problem, 'exhausted'))
+    finally:
+        #jump points are expanded without problem.expand, count them where the agents look
+        if '_expanded' in dir(problem):
+            problem._expanded += expanded
+
+def jumpPointSearch(problem, goal=None, maxExpansions=None, deadline=None, statistics=False):
+    """
+    Jump point search (JPS) for a PositionSearchProblem on a 4-connected
+    grid where every move costs 1.  A* over jump points with the Manhattan
+    distance: returns a path as short as aStarSearch with
+    manhattanHeuristic, while expanding only the states where a shortest
+    path may have to turn, an order of magnitude fewer on open layouts.
+
+    The search reads problem.walls directly and heads for goal (default
+    problem.goal); it ignores costFn.  If the budget runs out the partial
+    path leads to the jump point closest to the goal.
+    """
+    return runSearchEvents(jumpPointEvents(problem, goal, maxExpansions, deadline, statistics, steps=False))
+
+
+#bidirectional searches run one search forward from the start and one backward from a single goal state
+#(problem.goal unless a goal is given) and stop when the two meet
+#the backward search reuses problem.expand so the moves of the problem must be reversible, like pacman moves on a grid
+#the child of a backward expansion is a predecessor and the forward action is the reverse of the returned action
+
+def reverse_expand(problem, state):
+    """
+    Returns (predecessor, action, stepCost) triples for a problem with
+    reversible moves, where 'action' leads from predecessor to state and
+    'stepCost' is the cost of taking it.
+    """
+    from game import Actions
+    predecessors = []
+    for previous , action , cost in problem.expand(state):
+        forward = Actions.reverseDirection(action)
+        predecessors.append((previous, forward, problem.getActionCost(previous, forward, state)))
+    return predecessors
+
+def join_paths(meet , forward_parent , backward_parent):
+    #the forward half is a normal path to the meeting state, the backward half is read from the meeting state towards the goal
+    actions = reconstruct_path(meet , forward_parent)
+    child , action = backward_parent[meet]
+    while child != None:
+        actions.append(action)
+        child , action = backward_parent[child]
+    return actions
+
+def bidirectionalEvents(problem, goal=None, maxExpansions=None, deadline=None, statistics=False, steps=True):
+    "bidirectionalSearch, one event at a time"
+    monitor = SearchMonitor(maxExpansions, deadline, statistics)
+    expanders = [monitor.expander(problem.expand), monitor.expander(lambda state: reverse_expand(problem, state))]
+    start = problem.getStartState()
+    if goal == None:
+        goal = problem.goal
+    if start == goal:
+        yield SearchEvent('goal', start, 0, actions=monitor.finish([], problem))
+        return
+
+    #depth holds the distance from the side's root, parent the (state , action) pair pointing back to that root
+    depth = [{start: 0}, {goal: 0}]
+    parent = [{start: (None , ' ')}, {goal: (None , ' ')}]
+    layer = [[start], [goal]]
+    last_forward = start
+
+    while layer[0] and layer[1]:
+        side = 0 if len(layer[0]) <= len(layer[1]) else 1
+        mine , other = depth[side], depth[1 - side]
+        best , meet , next_layer = float('inf'), None , []
+
+        #the whole layer is expanded before stopping, the first meeting state found is not always on a shortest path
+        for state in layer[side]:
+            reason = monitor.charge(len(layer[0]) + len(layer[1]) + len(next_layer), len(depth[0]) + len(depth[1]))
+            if reason:
+                yield SearchEvent('budget', state, mine[state], actions=monitor.finish(reconstruct_path(last_forward , parent[0]), problem, reason), reason=reason)
+                return
+            if side == 0:
+                last_forward = state
+            if steps:
+                yield SearchEvent('expand', state, mine[state])
+            for child , action , cost in expanders[side](state):
+                if child in mine:
+                    continue
+                mine[child] = mine[state] + 1
+                parent[side][child] = (state , action)
+                next_layer.append(child)
+                if child in other and mine[child] + other[child] < best:
+                    best , meet = mine[child] + other[child], child
+                if steps:
+                    yield SearchEvent('generate', child, mine[child], state, action)
+        if meet != None:
+            yield SearchEvent('goal', meet, best, actions=monitor.finish(join_paths(meet , parent[0] , parent[1]), problem))
+            return
+        layer[side] = next_layer
+
+    yield SearchEvent('exhausted', actions=monitor.finish([], problem, 'exhausted'))
+
+def bidirectionalSearch(problem, goal=None, maxExpansions=None, deadline=None, statistics=False):
+    """
+    Search breadth first from the start and from the goal at the same time,
+    one whole layer at a time from the side with the smaller frontier, until
+    the two searches meet.  On open layouts this expands roughly the square
+    root of the states a one-sided breadth first search would.  If the
+    budget runs out the partial path leads to the last state the forward
+    side expanded.
+    """
+    return runSearchEvents(bidirectionalEvents(problem, goal, maxExpansions, deadline, statistics, steps=False))
+
+def bidirectionalAStarEvents(problem, heuristic=nullHeuristic, goal=None, maxExpansions=None, deadline=None, statistics=False, steps=True):
+    "bidirectionalAStarSearch, one event at a time"
+    import copy
+    monitor = SearchMonitor(maxExpansions, deadline, statistics)
+    heuristic = monitor.timedHeuristic(heuristic)
+    start = problem.getStartState()
+    if goal == None:
+        goal = problem.goal
+    if start == goal:
+        yield SearchEvent('goal', start, 0, actions=monitor.finish([], problem))
+        return
+
+    reverse = copy.copy(problem)
+    reverse.startState , reverse.goal = goal , start
+    heuristics = [lambda state: heuristic(state , problem), lambda state: heuristic(state , reverse)]
+    expanders = [monitor.expander(problem.expand), monitor.expander(lambda state: reverse_expand(problem, state))]
+
+    cost = [{start: 0}, {goal: 0}]
+    parent = [{start: (None , ' ')}, {goal: (None , ' ')}]
+    frontier = [util.PriorityQueue(), util.PriorityQueue()]
+    start_h = heuristics[0](start)
+    frontier[0].push(start , max(start_h, 0))
+    frontier[1].push(goal , max(heuristics[1](goal), 0))
+    best , meet = float('inf'), None
+    best_h , best_state = start_h , start
+
+    while not frontier[0].isEmpty() and not frontier[1].isEmpty():
+        lowest = [frontier[0].peekPriority(), frontier[1].peekPriority()]
+        if best <= min(lowest):
+            break
+        queued = len(frontier[0]) + len(frontier[1])
+        reason = monitor.charge(queued, len(cost[0]) + len(cost[1]) - queued)
+        if reason:
+            yield SearchEvent('budget', best_state, cost[0][best_state], actions=monitor.finish(reconstruct_path(best_state , parent[0]), problem, reason), reason=reason)
+            return
+        side = 0 if lowest[0] <= lowest[1] else 1
+        mine , other = cost[side], cost[1 - side]
+        state = frontier[side].pop()
+        if steps:
+            yield SearchEvent('expand', state, mine[state])
+
+        for child , action , step_cost in expanders[side](state):
+            total = mine[state] + step_cost
+            if child in mine and mine[child] <= total:
+                continue
+            if child in mine:
+                monitor.duplicate()
+            mine[child] = total
+            parent[side][child] = (state , action)
+            h = heuristics[side](child)
+            frontier[side].push(child , max(total + h, 2 * total))
+            if side == 0 and h < best_h:
+                best_h , best_state = h , child
+            if child in other and total + other[child] < best:
+                best , meet = total + other[child], child
+            if steps:
+                yield SearchEvent('generate', child, total, state, action)
+
+    if meet == None:
+        yield SearchEvent('exhausted', actions=monitor.finish([], problem, 'exhausted'))
+        return
+    yield SearchEvent('goal', meet, best, actions=monitor.finish(join_paths(meet , parent[0] , parent[1]), problem))
+
+def bidirectionalAStarSearch(problem, heuristic=nullHeuristic, goal=None, maxExpansions=None, deadline=None, statistics=False):
+    """
+    Bidirectional A* that meets in the middle (MM).  Each side orders its
+    frontier by max(g + h, 2g), always expands the side with the lower
+    priority, and stops as soon as the best path through a meeting state
+    costs no more than the lowest priority left on either side; with an
+    admissible heuristic that path is optimal.
+
+    The backward side evaluates the heuristic on a copy of the problem with
+    start and goal swapped, so heuristics that measure towards problem.goal
+    (manhattanHeuristic, euclideanHeuristic) work in both directions.  If
+    the budget runs out the partial path leads to the state with the lowest
+    h the forward side generated.
+    """
+    return runSearchEvents(bidirectionalAStarEvents(problem, heuristic, goal, maxExpansions, deadline, statistics, steps=False))
+
+
+#external memory breadth first search keeps nothing but the layer being expanded in memory
+#every layer lives on disk as a file of (key, state, parent key, action) records sorted by key, the key being the
+#code of the state (and the state left out) if the problem has an encoding, else the pickled state: children are written out in sorted runs, the runs are merged into the next layer and duplicates
+#(in the runs or in earlier layers) are found by merging the sorted streams instead of looking them up in a set
+
+def stateRecord(problem, state, parent, action):
+    #a problem with an encoding stores just the code of the state, which decodes back to it
+    code = problem.encode(state) if hasattr(problem, 'encode') else None
+    if code != None:
+        return (code , None , parent , action)
+    import pickle
+    return (pickle.dumps(state, pickle.HIGHEST_PROTOCOL), state , parent , action)
+
+def writeRecords(path, records):
+    import pickle
+    count = 0
+    with open(path, 'wb') as out:
+        for record in records:
+            pickle.dump(record, out, pickle.HIGHEST_PROTOCOL)
+            count += 1
+    return count
+
+def readRecords(path):
+    import pickle
+    with open(path, 'rb') as source:
+        while True:
+            try:
+                yield pickle.load(source)
+            except EOFError:
+                return
+
+def uniqueRecords(records):
+    #the first record of every key in a stream sorted by key
+    last = None
+    for record in records:
+        if record[0] != last:
+            last = record[0]
+            yield record
+
+def withoutKeys(records, path):
+    #the records whose key is not in the sorted file at path, both streams sorted by key
+    known = readRecords(path)
+    current = next(known , None)
+    for record in records:
+        while current != None and current[0] < record[0]:
+            current = next(known , None)
+        if current == None or current[0] != record[0]:
+            yield record
+
+def externalBreadthFirstEvents(problem, directory=None, runSize=100000, undirected=False, fanIn=64, maxExpansions=None, deadline=None, statistics=False, steps=True):
+    "externalBreadthFirstSearch, one event at a time; a child is generated when it is written to a run, before duplicates are dropped"
+    import os
+    import shutil
+    import tempfile
+
+    monitor = SearchMonitor(maxExpansions, deadline, statistics)
+    expand = monitor.expander(problem.expand)
+    workspace = tempfile.mkdtemp(prefix='search-', dir=directory)
+    layers = []
+
+    def layerPath(depth):
+        return os.path.join(workspace , 'layer-%d' % depth)
+
+    def path(depth , key):
+        #walks the parent keys back through the layers, every layer file is read once
+        actions = []
+        for depth in range(depth , 0 , -1):
+            for record in readRecords(layerPath(depth)):
+                if record[0] == key:
+                    key , action = record[2] , record[3]
+                    actions.append(action)
+                    break
+        return actions[::-1]
+
+    def sortedRun(records , number):
+        records.sort(key=lambda record: record[0])
+        runPath = os.path.join(workspace , 'run-%d' % number)
+        writeRecords(runPath , records)
+        return runPath
+
+    def mergedRuns(runs):
+        #sorted streams of runs merged together, stable so that the first record of a key stays first
+        return heapq.merge(*[readRecords(run) for run in runs], key=lambda record: record[0])
+
+    def mergePasses(runs):
+        #merges fanIn consecutive runs into one until at most fanIn are left, in order to keep the merge stable
+        number = len(runs)
+        while len(runs) > fanIn:
+            longer = []
+            for i in range(0 , len(runs) , fanIn):
+                group = runs[i:i + fanIn]
+                if len(group) == 1:
+                    longer.append(group[0])
+                    continue
+                runPath = os.path.join(workspace , 'run-%d' % number)
+                number += 1
+                writeRecords(runPath , uniqueRecords(mergedRuns(group)))
+                for run in group:
+                    os.remove(run)
+                longer.append(runPath)
+            runs = longer
+        return runs
+
+    try:
+        start = problem.getStartState()
+        size = writeRecords(layerPath(0) , [stateRecord(problem , start , None , None)])
+        layers.append(layerPath(0))
+        depth = 0
+        while size:
+            runs , buffer , children = [], [], 0
+            for key , state , parent , action in readRecords(layers[-1]):
+                if state == None:
+                    state = problem.decode(key)
+                if problem.isGoalState(state):
+                    yield SearchEvent('goal', state, depth, actions=monitor.finish(path(depth , key), problem))
+                    return
+                reason = monitor.charge(size , 0)
+                if reason:
+                    yield SearchEvent('budget', state, depth, actions=monitor.finish(path(depth , key), problem, reason), reason=reason)
+                    return
+                if steps:
+                    yield SearchEvent('expand', state, depth)
+                for next_state , next_action , cost in expand(state):
+                    buffer.append(stateRecord(problem , next_state , key , next_action))
+                    children += 1
+                    if steps:
+                        yield SearchEvent('generate', next_state, depth + 1, state, next_action)
+                if len(buffer) >= runSize:
+                    runs.append(sortedRun(buffer , len(runs)))
+                    buffer = []
+            if buffer:
+                runs.append(sortedRun(buffer , len(runs)))
+
+            #merge the runs, keep the first record of every key and drop the keys of earlier layers
+            runs = mergePasses(runs)
+            records = uniqueRecords(mergedRuns(runs))
+            earlier = layers[-2:] if undirected else layers
+            for i in range(0 , len(earlier) , fanIn):
+                for layer in earlier[i:i + fanIn]:
+                    records = withoutKeys(records , layer)
+                if i + fanIn < len(earlier):
+                    #the earlier layers are read fanIn at a time as well, the records go through a file in between
+                    filtered = os.path.join(workspace , 'filtered-%d' % (i // fanIn % 2))
+                    writeRecords(filtered , records)
+                    records = readRecords(filtered)
+            depth += 1
+            size = writeRecords(layerPath(depth) , records)
+            monitor.duplicates += children - size
+            for run in runs:
+                os.remove(run)
+            layers.append(layerPath(depth))
+
+        yield SearchEvent('exhausted', actions=monitor.finish([], problem, 'exhausted'))
+    finally:
+        shutil.rmtree(workspace , ignore_errors=True)
+
+def externalBreadthFirstSearch(problem, directory=None, runSize=100000, undirected=False, fanIn=64, maxExpansions=None, deadline=None, statistics=False):
+    """
+    Breadth first search that keeps its layers on disk, for state spaces
+    larger than memory.  Each layer is a file sorted by state key; the
+    children of a layer are sorted in runs of runSize records, merged
+    into the next layer, and duplicates are dropped by merging against
+    the earlier layers.  The path is rebuilt from the stored parent keys.
+
+    With undirected=True (every move can be undone, as for a
+    PositionSearchProblem) only the two previous layers can hold
+    duplicates, so each new layer is merged against those two instead of
+    against every earlier layer.  Files go to a temporary directory inside 'directory' (default: the
+    system temporary directory) that is removed at the end.
+
+    At most fanIn runs are merged at a time: when a layer has more runs,
+    they are first merged fanIn at a time into longer runs.  The earlier
+    layers are likewise merged against fanIn at a time, so that the number
+    of open files stays bounded however large or deep the search gets.
+    """
+    return runSearchEvents(externalBreadthFirstEvents(problem, directory, runSize, undirected, fanIn, maxExpansions, deadline, statistics, steps=False))
+
+#multi target sweeps answer nearest-of-many questions with one search instead of one search per target
+
+def nearestTargets(problem, targets, k=None):
+    """
+    Dijkstra from the start state of problem towards a set of target
+    states.  Returns a dict of target -> cost of the cheapest path to it,
+    in order of increasing cost, holding the k nearest reachable targets
+    (all reachable targets if k is None).  The sweep stops as soon as the
+    k nearest are known.
+    """
+    targets = set(targets)
+    wanted = len(targets) if k == None else min(k , len(targets))
+    start = problem.getStartState()
+    frontier = util.BucketPriorityQueue()
+    frontier.push(start , 0)
+    cost = {start : 0}
+    found = {}
+
+    while len(found) < wanted and not frontier.isEmpty():
+        state = frontier.pop()
+        if state in targets:
+            found[state] = cost[state]
+            if len(found) == wanted:
+                break
+        for next_state , action , step_cost in problem.expand(state):
+            total = cost[state] + step_cost
+            if next_state not in cost or cost[next_state] > total:
+                cost[next_state] = total
+                frontier.update(next_state , total)
+    return found
+
+def distancesToTargets(problem, targets):
+    """
+    Multi-source Dijkstra backward from every target at once.  Returns a
+    dict of state -> cost of the cheapest path from that state to its
+    nearest target, for every state that can reach a target.  Uses
+    reverse_expand, so the moves of the problem must be reversible.
+    """
+    frontier = util.BucketPriorityQueue()
+    cost = {}
+    for target in targets:
+        cost[target] = 0
+        frontier.push(target , 0)
+    distances = {}
+
+    while not frontier.isEmpty():
+        state = frontier.pop()
+        distances[state] = cost[state]
+        for previous , action , step_cost in reverse_expand(problem , state):
+            total = cost[state] + step_cost
+            if previous not in cost or cost[previous] > total:
+                cost[previous] = total
+                frontier.update(previous , total)
+    return distances
+
+#incremental search keeps its tables between plans, so planning again after the start moved or a goal went away only
+#repairs the states whose distance changed instead of searching from scratch
+
+class DStarLite:
+    """
+    D* Lite (Koenig and Likhachev) towards the nearest of a set of goal
+    states.  The search runs backward from the goals to the current start,
+    so g holds the distance from a state to its nearest goal, and keeps
+    g, rhs and its frontier between calls to plan().  After moveStart()
+    and removeGoal()/addGoal() the next plan() only repairs the states
+    whose distance changed.
+
+    Moves must be reversible with symmetric costs, so that the children of
+    a state are also its predecessors.
+    distance(a, b) must never overestimate the cost between two states and
+    satisfy the triangle inequality (the Manhattan distance on a grid); the
+    default of 0 makes every repair a Dijkstra sweep.
+    """
+    def __init__(self, problem, goals, distance=None):
+        self.problem = problem
+        self.start = problem.getStartState()
+        self.distance = distance if distance != None else (lambda a, b: 0)
+        self.expanded = 0
+        self.neighbours = {}
+        self.goals = set()
+        self.g , self.rhs = {}, {}
+        #a plain heap of (key, tie, state) entries; queued holds the current key of every queued state, and an entry
+        #whose key is no longer current is skipped when it comes up, which is cheaper than moving it inside the heap
+        self.frontier , self.queued = [], {}
+        self.tie = itertools.count()
+        self.offset = 0
+        self.last = self.start
+        self.reached = None
+        for goal in goals:
+            self.addGoal(goal)
+
+    def children(self, state):
+        #the moves never change, each state is expanded once and its children are kept for every later repair
+        children = self.neighbours.get(state)
+        if children == None:
+            children = self.neighbours[state] = self.problem.expand(state)
+        return children
+
+    def key(self, state):
+        least = min(self.g.get(state , float('inf')), self.rhs.get(state , float('inf')))
+        return (least + self.distance(self.start , state) + self.offset , least)
+
+    def updateState(self, state):
+        #rhs is the one step lookahead of g, a state is queued while the two disagree
+        g , inf = self.g , float('inf')
+        if state in self.goals:
+            best = self.rhs[state]
+        else:
+            best = inf
+            for child , action , cost in self.children(state):
+                total = cost + g.get(child , inf)
+                if total < best:
+                    best = total
+            self.rhs[state] = best
+        current = g.get(state , inf)
+        if current != best:
+            least = current if current < best else best
+            key = (least + self.distance(self.start , state) + self.offset , least)
+            if self.queued.get(state) != key:
+                self.queued[state] = key
+                heapq.heappush(self.frontier , (key , next(self.tie) , state))
+        elif state in self.queued:
+            del self.queued[state]
+
+    def addGoal(self, goal):
+        self.goals.add(goal)
+        self.rhs[goal] = 0
+        self.updateState(goal)
+
+    def removeGoal(self, goal):
+        if goal in self.goals:
+            self.goals.discard(goal)
+            self.updateState(goal)
+
+    def moveStart(self, state):
+        #every key already queued is too high by the distance the start moved, the offset makes up for it
+        self.start = state
+        self.offset += self.distance(self.last , state)
+        self.last = state
+
+    def plan(self):
+        """
+        Repairs the distances and returns the actions from the start to the
+        nearest goal, [] if none is reachable.  The goal the actions lead to
+        is left in reached.
+        """
+        frontier , queued , g , rhs = self.frontier , self.queued , self.g , self.rhs
+        start , distance , offset , updateState = self.start , self.distance , self.offset , self.updateState
+        toStart , inf = distance(start , start) + offset , float('inf')
+        while frontier:
+            old , tie , state = frontier[0]
+            if queued.get(state) != old:
+                heapq.heappop(frontier)
+                continue
+            startG , startRhs = g.get(start , inf), rhs.get(start , inf)
+            least = startG if startG < startRhs else startRhs
+            if startG == startRhs and old >= (least + toStart , least):
+                break
+            heapq.heappop(frontier)
+            del queued[state]
+            self.expanded += 1
+            current , best = g.get(state , inf), rhs[state]
+            least = current if current < best else best
+            new = (least + distance(start , state) + offset , least)
+            if old < new:
+                queued[state] = new
+                heapq.heappush(frontier , (new , next(self.tie) , state))
+            elif current > best:
+                g[state] = best
+                for previous , action , cost in self.children(state):
+                    updateState(previous)
+            else:
+                g[state] = inf
+                updateState(state)
+                for previous , action , cost in self.children(state):
+                    updateState(previous)
+        return self.path()
+
+    def path(self):
+        #walks downhill on g, every step goes to the child with the lowest step cost plus distance to a goal
+        g , state , actions = self.g , self.start , []
+        self.reached = None
+        if g.get(state , float('inf')) == float('inf'):
+            return []
+        while state not in self.goals:
+            total , child , action = min((cost + g.get(child , float('inf')), child , action) for child , action , cost in self.children(state))
+            state = child
+            actions.append(action)
+        self.reached = state
+        return actions
+
+#hash distributed A* (HDA*) runs one A* per worker process, every state is owned by the worker hash(state) % workers
+#and children owned by another worker are sent to it in batches through its inbox queue
+#workers are forked so the problem and the heuristic never have to be pickled, only states travel through the queues
+#
+#termination uses one shared counter of outstanding work: a worker holds one unit while its frontier has a node with
+#f below the incumbent cost and every batch in flight holds one unit, a sender adds the unit of a batch before putting it
+#and a receiver takes its own unit before dropping the unit of the batch, so the counter never rises again once it is 0
+#and 0 means no worker can improve on the incumbent, which is then optimal for an admissible heuristic
+
+def hdaOwner(state , workers):
+    return hash(state) % workers
+
+def hdaWorker(index , problem , heuristic , inboxes , results , shared , maxExpansions , statistics , batch , integral):
+    work , incumbent , expansions , stop = shared
+    monitor = SearchMonitor(statistics=statistics)
+    expand = monitor.expander(problem.expand)
+    heuristic = monitor.timedHeuristic(heuristic)
+    workers = len(inboxes)
+    inbox = inboxes[index]
+    frontier = util.BucketPriorityQueue() if integral else util.PriorityQueue()
+    cost , parent_action = {}, {}
+    best_h , best_state = float('inf'), None
+    outgoing = [[] for i in range(workers)]
+    active = False
+    bound = float('inf')
+
+    def add(state , total , parent , action):
+        #the same test as aStarSearch, children owned by this worker skip the queues
+        nonlocal best_h , best_state
+        if state in cost and cost[state] <= total:
+            return
+        if state in cost:
+            monitor.duplicate()
+        cost[state] = total
+        parent_action[state] = (parent , action)
+        h = heuristic(state , problem)
+        if total + h < bound:
+            frontier.update(state , total + h)
+        if h < best_h:
+            best_h , best_state = h , state
+
+    def useful():
+        return not frontier.isEmpty() and frontier.peekPriority() < bound
+
+    def release():
+        with work.get_lock():
+            work.value -= 1
+            if work.value == 0:
+                results.put(('done',))
+
+    while True:
+        #an active worker only looks at its inbox between batches, an idle one waits for it
+        if not active or stop.value:
+            message = inbox.get()
+        else:
+            try:
+                message = inbox.get_nowait()
+            except queue.Empty:
+                message = None
+        if message != None:
+            kind = message[0]
+            if kind == 'quit':
+                return
+            if kind == 'trace':
+                results.put(('trace', parent_action.get(message[1])))
+            elif kind == 'report':
+                results.put(('report', index, best_h, best_state, monitor))
+            elif kind == 'nodes':
+                if not stop.value:
+                    bound = incumbent.value
+                    for state , total , parent , action in message[1]:
+                        add(state , total , parent , action)
+                    if not active and useful():
+                        with work.get_lock():
+                            work.value += 1
+                        active = True
+                release()
+            continue
+        if stop.value:
+            continue
+
+        #workers never wait for each other: one that is ahead expands states above the f of the others, which a
+        #sequential A* might never reach, and the incumbent bound prunes what turns out to be too expensive
+        bound = incumbent.value
+        done = 0
+        while done < batch and useful():
+            state = frontier.pop()
+            if problem.isGoalState(state):
+                with incumbent.get_lock():
+                    if cost[state] < incumbent.value:
+                        incumbent.value = cost[state]
+                        results.put(('goal', cost[state], state))
+                bound = incumbent.value
+                continue
+            monitor.charge(len(frontier), len(cost) - len(frontier))
+            done += 1
+            for child , action , step_cost in expand(state):
+                owner = hdaOwner(child , workers)
+                if owner == index:
+                    add(child , cost[state] + step_cost , state , action)
+                else:
+                    outgoing[owner].append((child , cost[state] + step_cost , state , action))
+
+        for owner in range(workers):
+            if outgoing[owner]:
+                with work.get_lock():
+                    work.value += 1
+                inboxes[owner].put(('nodes', outgoing[owner]))
+                outgoing[owner] = []
+        with expansions.get_lock():
+            expansions.value += done
+            if maxExpansions != None and expansions.value >= maxExpansions and not stop.value:
+                stop.value = 1
+                results.put(('stopped', 'maxExpansions'))
+        if not useful():
+            active = False
+            release()
+
+def hdaProcess(index , *arguments):
+    try:
+        hdaWorker(index , *arguments)
+    except Exception:
+        import traceback
+        arguments[3].put(('error', traceback.format_exc()))
+
+def hdaCoordinate(start , inboxes , results , stop , monitor):
+    """
+    The coordinating side of hashDistributedAStarSearch: seeds the owner of
+    the start state, waits until the workers run out of work or are stopped,
+    adds their statistics to monitor and traces the path back through them.
+    Returns the actions, the reason the search ended and the best goal as
+    (cost, state), or None.
+    """
+    workers = len(inboxes)
+    goal = None
+
+    def receive(kind):
+        #waits for a message of the given kind, keeping track of the incumbent goal on the way
+        nonlocal goal
+        while True:
+            message = results.get()
+            if message[0] == 'error':
+                raise Exception('An HDA* worker failed:\n' + message[1])
+            if message[0] == 'goal' and (goal == None or message[1] < goal[0]):
+                goal = message[1:]
+            if message[0] == kind:
+                return message
+
+    inboxes[hdaOwner(start , workers)].put(('nodes', [(start, 0, None, ' ')]))
+    reason = None
+    while reason == None:
+        try:
+            timeout = None if monitor.deadline == None else max(0, monitor.deadline - time.time())
+            message = results.get(timeout=timeout)
+        except queue.Empty:
+            reason = 'deadline'
+            continue
+        if message[0] == 'error':
+            raise Exception('An HDA* worker failed:\n' + message[1])
+        if message[0] == 'goal' and (goal == None or message[1] < goal[0]):
+            goal = message[1:]
+        if message[0] == 'done':
+            reason = 'done'
+        if message[0] == 'stopped':
+            reason = message[1]
+    stop.value = 1
+
+    #once every worker has answered a report no worker expands anything anymore
+    best_h , best_state = float('inf'), start
+    for inbox in inboxes:
+        inbox.put(('report',))
+    for i in range(workers):
+        index , h , state , worker = receive('report')[1:]
+        if state != None and h < best_h:
+            best_h , best_state = h , state
+        monitor.expanded += worker.expanded
+        monitor.generated += worker.generated
+        monitor.duplicates += worker.duplicates
+        monitor.maxFrontier = max(monitor.maxFrontier , worker.maxFrontier)
+        monitor.maxClosed = max(monitor.maxClosed , worker.maxClosed)
+        monitor.heuristicCalls += worker.heuristicCalls
+        monitor.heuristicTime += worker.heuristicTime
+        monitor.expandTime += worker.expandTime
+
+    #the goal of one worker can arrive after the 'done' of another, but never after its own report,
+    #so only now is it known whether the search found a goal
+    if reason == 'done':
+        reason = 'goal' if goal != None else 'exhausted'
+
+    #the parent pointers are spread over the workers, so the path is traced one owner at a time
+    state = goal[1] if goal != None else best_state
+    actions = []
+    while reason != 'exhausted':
+        inboxes[hdaOwner(state , workers)].put(('trace', state))
+        entry = receive('trace')[1]
+        if entry == None or entry[0] == None:
+            break
+        state , action = entry
+        actions.append(action)
+    actions.reverse()
+    return actions , reason , goal
+
+def hashDistributedAStarSearch(problem, heuristic=nullHeuristic, workers=None, maxExpansions=None, deadline=None, statistics=False, batch=64):
+    """
+    Hash distributed A* (HDA*).  The states are partitioned by hash across
+    'workers' processes (default: one per CPU), each with its own frontier
+    and closed set, and expanded in parallel.  Returns an optimal path for
+    an admissible heuristic, like aStarSearch.  Pays off when expanding a
+    state is expensive, e.g. FoodSearchProblem with foodHeuristic; cheap
+    problems spend more time in the queues than in the search.
+
+    batch is the number of states a worker expands between sending its
+    children to their owners.  Workers never wait for each other, so there
+    are never more workers than CPUs: a worker sharing its CPU with another
+    one runs a whole time slice ahead of the rest and expands states far
+    above the optimal cost.  Falls back to aStarSearch for one worker or
+    where processes cannot be forked.
+    """
+    import multiprocessing
+    if workers == None or workers > multiprocessing.cpu_count():
+        workers = multiprocessing.cpu_count()
+    if workers <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        return aStarSearch(problem, heuristic, maxExpansions, deadline, statistics)
+
+    #the budget is shared: workers add their expansions to one counter per batch, so maxExpansions
+    #can be overshot by at most a batch per worker, and the deadline is kept here
+    #a stopped search follows the incumbent path if there is one, otherwise the path to the lowest h state of all workers
+
+    #the start heuristic is evaluated before forking, like aStarSearch does first, so heuristics that fill
+    #problem.heuristicInfo on the start state (foodHeuristic) hand the same tables to every worker
+
+    monitor = SearchMonitor(maxExpansions, deadline, statistics)
+    start = problem.getStartState()
+    if problem.isGoalState(start):
+        return monitor.finish([], problem)
+    integral = util.isIntegral(heuristic(start , problem))
+
+    context = multiprocessing.get_context('fork')
+    inboxes = [context.Queue() for i in range(workers)]
+    results = context.Queue()
+    work = context.Value('i', 1)
+    incumbent = context.Value('d', float('inf'))
+    expansions = context.Value('l', 0)
+    stop = context.Value('i', 0)
+    shared = (work, incumbent, expansions, stop)
+    processes = [context.Process(target=hdaProcess, args=(index, problem, heuristic, inboxes, results, shared, maxExpansions, statistics, batch, integral), daemon=True)
+                 for index in range(workers)]
+    for process in processes:
+        process.start()
+
+    try:
+        actions , reason , goal = hdaCoordinate(start , inboxes , results , stop , monitor)
+        if '_expanded' in dir(problem):
+            problem._expanded += monitor.expanded
+    finally:
+        stop.value = 1
+        for inbox in inboxes:
+            inbox.put(('quit',))
+        for process in processes:
+            process.join(1)
+            if process.is_alive():
+                process.terminate()
 
-    return []
+    if reason in ('goal', 'exhausted'):
+        return monitor.finish(actions, problem, reason)
+    return monitor.finish(actions, problem, reason, goal != None)
 
 
 # Abbreviations
 bfs = breadthFirstSearch
 dfs = depthFirstSearch
 astar = aStarSearch
+ucs = uniformCostSearch
+bibfs = bidirectionalSearch
+mm = bidirectionalAStarSearch
+ida = iterativeDeepeningAStar
+wastar = weightedAStarSearch
+arastar = anytimeRepairingAStar
+hda = hashDistributedAStarSearch
+jps = jumpPointSearch
+beam = beamSearch
+bounded = boundedBestFirstSearch
+smastar = memoryBoundedAStar
+ebfs = externalBreadthFirstSearch
+greedy = greedyBestFirstSearch
+dfsEvents = depthFirstEvents
+bfsEvents = breadthFirstEvents
+ucsEvents = uniformCostEvents
+astarEvents = aStarEvents
+greedyEvents = greedyBestFirstEvents
+wastarEvents = weightedAStarEvents
+arastarEvents = anytimeRepairingEvents
+bibfsEvents = bidirectionalEvents
+mmEvents = bidirectionalAStarEvents
+idaEvents = iterativeDeepeningEvents
+jpsEvents = jumpPointEvents
+boundedEvents = boundedBestFirstEvents
+smastarEvents = memoryBoundedEvents
+ebfsEvents = externalBreadthFirstEvents
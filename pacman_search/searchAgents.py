@@ -37,8 +37,13 @@ Good luck and happy searching!
 from game import Directions
 from game import Agent
 from game import Actions
+from game import bitGrid, BitGrid
 import util
 import time
+import types
+import os
+import pickle
+import hashlib
 import search
 
 class GoWestAgent(Agent):
@@ -68,21 +73,71 @@ class SearchAgent(Agent):
     Options for fn include:
       depthFirstSearch or dfs
       breadthFirstSearch or bfs
-
-
-    Note: You should NOT change any code in SearchAgent
+      uniformCostSearch or ucs
+      aStarSearch or astar (tiebreak='fifo', 'lifo', 'g' or 'h')
+      greedyBestFirstSearch or greedy (tiebreak=...)
+      bidirectionalSearch or bibfs
+      bidirectionalAStarSearch or mm
+      iterativeDeepeningAStar or ida
+      hashDistributedAStarSearch or hda (parallel A*, e.g. workers=16)
+      jumpPointSearch or jps (PositionSearchProblem with unit costs only)
+      beamSearch or beam (width=..., evaluation='h' or 'g+h')
+      boundedBestFirstSearch or bounded (width=..., evaluation='h' or 'g+h')
+      memoryBoundedAStar or smastar (maxNodes=...)
+      externalBreadthFirstSearch or ebfs (directory=..., runSize=..., undirected=True)
+      the streaming version of any of these but hda, run to the end:
+        depthFirstEvents or dfsEvents, memoryBoundedEvents or smastarEvents,
+        ... (the final Search or AStar of the name replaced by Events, or
+        the short name followed by Events)
+
+    Complete paths are cached, so a repeated game on the same layout (e.g.
+    pacman.py -n 20) reuses the path instead of searching again.  The cache
+    keeps the cacheSize most recently used paths in memory and, with
+    cacheDir=..., also stores them on disk for later runs; cache=False turns
+    it off.
+
+    Other agent arguments are passed to the search function, for example
+    -a fn=ida,heuristic=foodHeuristic,prob=FoodSearchProblem,transpositionTable=100000
+
+    Every search function takes maxExpansions and deadline (in seconds)
+    budgets.  A search that runs out of budget returns a partial path towards
+    its most promising state, which the agent follows instead of crashing.
+    With statistics=True the search also reports its path cost, generated
+    and duplicate states, peak frontier and closed set sizes and the time
+    spent in the heuristic and in expand.  Once a partial path is used up the
+    agent searches again from where it ended (see replan).
+
+    Constructor arguments, all given as -a name=value on the command line:
+      fn          the search function in search.py (default depthFirstSearch)
+      prob        the search problem type in this file (PositionSearchProblem)
+      heuristic   a function in this file or search.py (nullHeuristic), for
+                  the search functions that take one
+      cache       False turns the solution cache off (default True)
+      cacheSize   the number of paths the cache keeps in memory (64)
+      cacheDir    a directory where the cache also keeps its paths (None)
+      anything else is an argument of fn, e.g. maxExpansions=500
     """
 
-    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic'):
+    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic', cache=True, cacheSize=64, cacheDir=None, **searchArgs):
         # Warning: some advanced Python magic is employed below to find the right functions and problems
 
         # Get the search function from the name and heuristic
         if fn not in dir(search):
             raise AttributeError(fn + ' is not a search function in search.py.')
         func = getattr(search, fn)
+
+        # Any other agent argument is passed on to the search function, e.g. -a fn=ida,transpositionTable=100000
+        options = {}
+        for name, value in searchArgs.items():
+            if name not in func.__code__.co_varnames[:func.__code__.co_argcount]:
+                raise AttributeError(name + ' is not an argument of the search function ' + fn + '.')
+            options[name] = parseSearchArg(value)
+        if options:
+            print('[SearchAgent] using search options ' + ', '.join('%s=%s' % item for item in sorted(options.items())))
+
         if 'heuristic' not in func.__code__.co_varnames:
             print('[SearchAgent] using function ' + fn)
-            self.searchFunction = func
+            self.searchFunction = func if not options else lambda x: func(x, **self.budgeted(options))
         else:
             if heuristic in globals().keys():
                 heur = globals()[heuristic]
@@ -92,7 +147,7 @@ class SearchAgent(Agent):
                 raise AttributeError(heuristic + ' is not a function in searchAgents.py or search.py.')
             print('[SearchAgent] using function %s and heuristic %s' % (fn, heuristic))
             # Note: this bit of Python trickery combines the search algorithm and the heuristic
-            self.searchFunction = lambda x: func(x, heuristic=heur)
+            self.searchFunction = lambda x: func(x, heuristic=heur, **self.budgeted(options))
 
         # Get the search problem type from the name
         if prob not in globals().keys() or not prob.endswith('Problem'):
@@ -100,6 +155,11 @@ class SearchAgent(Agent):
         self.searchType = globals()[prob]
         print('[SearchAgent] using problem type ' + prob)
 
+        # Plans are cached under the search function, heuristic, options and problem type
+        if parseSearchArg(str(cache)):
+            self.cache = solutionCache(parseSearchArg(str(cacheSize)), cacheDir)
+            self.planName = repr((fn, heuristic, sorted(options.items())))
+
     def registerInitialState(self, state):
         """
         This is the first time that the agent sees the layout of the game
@@ -109,10 +169,40 @@ class SearchAgent(Agent):
 
         state: a GameState object (pacman.py)
         """
+        self.replannedFrom, self.budgetScale = set(), 1
+        self.plan(state)
+
+    def plan(self, state, useCache=True):
+        """
+        Finds the path from state, or a partial path if a budget stops the
+        search.  With useCache=False the solution cache is left alone, neither
+        looked up nor counted.
+        """
         if self.searchFunction == None: raise Exception("No search function provided for SearchAgent")
         starttime = time.time()
+        self.actionIndex = 0 # start the new path from its first action, also in the later games of pacman.py -n
         problem = self.searchType(state) # Makes a new search problem
+        cache = getattr(self, 'cache', None) if useCache else None
+        if cache != None:
+            key = planFingerprint(state, self.searchType, self.planName)
+            cached = cache.get(key)
+            if cached != None:
+                self.actions = cached
+                print('[SearchAgent] solution cache hit (%s)' % cache.report())
+                print('Path found with total cost of %d in %.1f seconds' % (problem.getCostOfActionSequence(self.actions), time.time() - starttime))
+                return
         self.actions  = self.searchFunction(problem) # Find a path
+        if isinstance(self.actions, types.GeneratorType):
+            self.actions = search.runSearchEvents(self.actions)
+        if cache != None:
+            # a partial path depends on the budget that stopped the search, so only complete paths are kept
+            if not isinstance(self.actions, search.SearchResult) or self.actions.complete:
+                cache.put(key, list(self.actions))
+            print('[SearchAgent] solution cache miss (%s)' % cache.report())
+        if isPartialPath(self.actions):
+            print('Search stopped early (%s) after %d expansions; following a partial path of %d actions' % (self.actions.reason, self.actions.expanded, len(self.actions)))
+        if isinstance(self.actions, search.SearchResult) and self.actions.cost != None:
+            print(self.actions.summary())
         totalCost = problem.getCostOfActionSequence(self.actions)
         print('Path found with total cost of %d in %.1f seconds' % (totalCost, time.time() - starttime))
         if '_expanded' in dir(problem): print('Search nodes expanded: %d' % problem._expanded)
@@ -123,9 +213,14 @@ class SearchAgent(Agent):
         registerInitialState).  Return Directions.STOP if there is no further
         action to take.
 
+        A partial path, left by a search whose budget ran out, is followed to
+        its end and then searched again from there (see replan).
+
         state: a GameState object (pacman.py)
         """
         if 'actionIndex' not in dir(self): self.actionIndex = 0
+        if self.actionIndex >= len(self.actions) and isPartialPath(self.actions):
+            self.replan(state)
         i = self.actionIndex
         self.actionIndex += 1
         if i < len(self.actions):
@@ -133,6 +228,114 @@ class SearchAgent(Agent):
         else:
             return Directions.STOP
 
+    def budgeted(self, options):
+        "The search options with the budgets widened by budgetScale (see replan)"
+        scale = getattr(self, 'budgetScale', 1)
+        if scale == 1:
+            return options
+        options = dict(options)
+        for budget in ('maxExpansions', 'deadline'):
+            if options.get(budget) != None:
+                options[budget] = options[budget] * scale
+        return options
+
+    def replan(self, state):
+        """
+        Searches again from state, where the partial path of a budgeted search
+        has ended.  The new path starts wherever the last one left pacman, so
+        it is neither looked up in the solution cache nor counted there.
+
+        Partial paths can send pacman around in a cycle, or leave it where it
+        is when no state within the budget looks closer to a goal, so once it
+        searches again from a state it has already searched from, the budget
+        doubles.  The budget grows only while pacman keeps coming back, and a
+        big enough budget finds a complete path.
+        """
+        start = self.searchType(state).getStartState()
+        if start in self.replannedFrom:
+            self.budgetScale *= 2
+        self.replannedFrom.add(start)
+        self.plan(state, useCache=False)
+
+def isPartialPath(actions):
+    "Returns true if actions were left by a search whose budget ran out before a goal"
+    return isinstance(actions, search.SearchResult) and not actions.complete
+
+def parseSearchArg(value):
+    """
+    Converts an agent argument from the command line, such as '3', '0.5' or
+    'True', to the Python value it spells; anything else stays a string.
+    """
+    import ast
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+
+class SolutionCache:
+    """
+    Paths found by SearchAgent, keyed on planFingerprint.  The most recently
+    used paths are kept in memory (a util.LRUCache of capacity paths); with
+    a directory every path is also pickled to a file named after its key,
+    so later runs find it too.  hits and misses count the lookups.
+    """
+    def __init__(self, capacity=64, directory=None):
+        self.memory = util.LRUCache(capacity)
+        self.directory = directory
+        self.hits = self.misses = 0
+        if directory != None:
+            os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(repr(key).encode()).hexdigest() + '.pickle')
+
+    def get(self, key):
+        "Returns the cached actions for key, or None"
+        actions = self.memory.get(key)
+        if actions == None and self.directory != None and os.path.exists(self.path(key)):
+            with open(self.path(key), 'rb') as file:
+                stored_key, actions = pickle.load(file)
+            if stored_key != key:
+                actions = None
+            else:
+                self.memory.put(key, actions)
+        if actions == None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return actions
+
+    def put(self, key, actions):
+        "Caches actions under key"
+        self.memory.put(key, actions)
+        if self.directory != None:
+            # written to a temporary file first so a reader never sees half a pickle
+            temporary = self.path(key) + '.%d' % os.getpid()
+            with open(temporary, 'wb') as file:
+                pickle.dump((key, actions), file)
+            os.replace(temporary, self.path(key))
+
+    def report(self):
+        return '%d hits, %d misses' % (self.hits, self.misses)
+
+_solutionCaches = {}
+def solutionCache(capacity=64, directory=None):
+    "The SolutionCache shared by every agent that caches in directory (None for memory only)"
+    if directory not in _solutionCaches:
+        _solutionCaches[directory] = SolutionCache(capacity, directory)
+    cache = _solutionCaches[directory]
+    cache.memory.capacity = max(cache.memory.capacity, capacity)
+    return cache
+
+def planFingerprint(gameState, searchType, planName):
+    """
+    The key of a plan: the walls, food and pacman's start in gameState, the
+    problem type and planName (the search function, heuristic and options).
+    """
+    walls, food = gameState.getWalls(), gameState.getFood()
+    return (planName, getattr(searchType, '__name__', repr(searchType)), walls.width, walls.height,
+            walls.asInt(), food.asInt(), gameState.getPacmanPosition())
+
 class PositionSearchProblem(search.SearchProblem):
     """
     A search problem defines the state space, start state, goal test, child
@@ -230,6 +433,14 @@ class PositionSearchProblem(search.SearchProblem):
         nextx, nexty = int(x + dx), int(y + dy)
         return (nextx, nexty)
 
+    def encode(self, state):
+        "The position as one int, x * height + y"
+        x, y = state
+        return x * self.walls.height + y
+
+    def decode(self, code):
+        return divmod(code, self.walls.height)
+
     def getCostOfActionSequence(self, actions):
         """
         Returns the cost of a particular sequence of actions. If those actions
@@ -391,6 +602,25 @@ class CornersProblem(search.SearchProblem):
         return ((nextx , nexty) , corners)
         
 
+    def encode(self, state):
+        """
+        The position times 625 plus the corners explored, in the order they
+        were explored, as base 5 digits (corner index + 1)
+        """
+        (x, y), corners_explored = state
+        code = 0
+        for corner in corners_explored:
+            code = code * 5 + self.corners.index(corner) + 1
+        return (x * self.walls.height + y) * 625 + code
+
+    def decode(self, code):
+        position, code = divmod(code, 625)
+        corners_explored = ()
+        while code:
+            code, digit = divmod(code, 5)
+            corners_explored = (self.corners[digit - 1], ) + corners_explored
+        return (divmod(position, self.walls.height), corners_explored)
+
     def getCostOfActionSequence(self, actions):
         """
         Returns the cost of a particular sequence of actions.  If those actions
@@ -453,24 +683,19 @@ def cornersHeuristic(state, problem):
     if problem.isGoalState(state):
         return 0
 
+    #one search from each corner gives its distances to all corners
     if state == problem.getStartState():
-        lenght = len(corners)
-        for i in range(lenght):
-            problem.info[corners[i]] = {}
-        for i in range(lenght):
-            for j in range(lenght):
-                problem.info[corners[i]][corners[j]] = mazeDistance(corners[i] , corners[j] , problem.start)
+        for corner in corners:
+            problem.info[corner] = mazeDistances(corner , corners , problem.start)
     
     unexplored = [x for x in corners if x not in corners_explored ]
     perms = list(permutations(unexplored))
     total = float("inf")
-    first = perms[0][0]
-    first_distance = mazeDistance(position , first , problem.start)
+    #and one search from the position gives its distances to every unexplored corner
+    first_distance = mazeDistances(position , unexplored , problem.start)
 
     for path in perms:
-        if first != path[0]: #permutations fix an element for several iterations. only calculate it again when it changes
-            first_distance = mazeDistance(position , path[0] , problem.start )
-        distance = first_distance + sum(problem.info[path[i]][path[i+1]] for i in range(len(path) - 1))
+        distance = first_distance[path[0]] + sum(problem.info[path[i]][path[i+1]] for i in range(len(path) - 1))
         if distance < total:
             total = distance
     '''
@@ -529,9 +754,13 @@ class FoodSearchProblem:
     A search state in this problem is a tuple ( pacmanPosition, foodGrid ) where
       pacmanPosition: a tuple (x,y) of integers specifying Pacman's position
       foodGrid:       a Grid (see game.py) of either True or False, specifying remaining food
+
+    The food grids of the states are frozen BitGrids, so a state costs a few
+    bytes instead of a list per column, hashes as one int and computes its
+    count and asList only once.
     """
     def __init__(self, startingGameState):
-        self.start = (startingGameState.getPacmanPosition(), startingGameState.getFood())
+        self.start = (startingGameState.getPacmanPosition(), bitGrid(startingGameState.getFood()).freeze())
         self.walls = startingGameState.getWalls()
         self.startingGameState = startingGameState
         self._expanded = 0 # DO NOT CHANGE
@@ -575,9 +804,17 @@ class FoodSearchProblem:
         x, y = state[0]
         dx, dy = Actions.directionToVector(action)
         nextx, nexty = int(x + dx), int(y + dy)
-        nextFood = state[1].copy()
-        nextFood[nextx][nexty] = False
-        return ((nextx, nexty), nextFood)
+        # a child that eats nothing shares the food grid of its parent
+        return ((nextx, nexty), state[1].withCell(nextx, nexty, False))
+
+    def encode(self, state):
+        "The food grid as an int (Grid.asInt) times the number of cells, plus the position x * height + y"
+        (x, y), food = state
+        return food.asInt() * (food.width * food.height) + x * food.height + y
+
+    def decode(self, code):
+        food, position = divmod(code, self.walls.width * self.walls.height)
+        return (divmod(position, self.walls.height), BitGrid(self.walls.width, self.walls.height, bits=food).freeze())
 
     def getCostOfActionSequence(self, actions):
         """Returns the cost of a particular sequence of actions.  If those actions
@@ -676,15 +913,11 @@ It expands 255 nodes
 Even if this is computationally heavy and requires a lot of memorization i decided to use it since all graphs of q6 are small or sparse
 and the expansions are very low
 
-However since i wanted to also solve bigSearch there is a commented section and when uncommented it will turn the heuristic into an approximation
-function for a while. Stoping the approximation at 60 food is a sweet spot(in my opinion) to run in a logical time while getting a great path in bigSearch. It basically discards not 
-promising nodes until the graph is sparse enought to be solved optimally
-When run like this it will solve mediumSearch in about 100 seconds finding a path of 152 
-and bigSearch in about 3 mins finding a path of 278 
-I m not sure if these are also optimal but if not the are very close
+To solve the hard mazes (mediumSearch, bigSearch) run this heuristic with weighted A* or ARA* instead of plain A*
+ARA* returns a path quickly and keeps improving it while reporting how far from optimal it can be at most, e.g.
 
-If you run it without the foods > 60 check it will also pass the autograder as admissible and consistent expanding 200 nodes
-while it clearly is an approximation function
+  python pacman.py -l bigSearch -p SearchAgent -a fn=arastar,prob=FoodSearchProblem,heuristic=foodHeuristic,deadline=120
+  python pacman.py -l mediumSearch -p SearchAgent -a fn=wastar,prob=FoodSearchProblem,heuristic=foodHeuristic,weight=2
 
 '''
 
@@ -750,12 +983,10 @@ def foodHeuristic(state, problem):
         return 0
     #pre-caclulation of all pairs of food actual distances
     #also keeping the food when the game starts
+    #one search per food gives its distances to all the others
     if state == problem.start:
         for i in range(foods):
-            problem.heuristicInfo[food[i]] = {}
-        for i in range(foods):
-            for j in range(foods):
-                problem.heuristicInfo[food[i]][food[j]] = mazeDistance(food[i] , food[j] , problem.startingGameState)
+            problem.heuristicInfo[food[i]] = mazeDistances(food[i] , food , problem.startingGameState)
         problem.heuristicInfo['starting_food'] = food
     
     #this is for dense graphs. if a graph is very dense there is a high chance that the node contained a food and distances are already calculated
@@ -766,13 +997,8 @@ def foodHeuristic(state, problem):
                 a.append(problem.heuristicInfo[position][f])
             closest = min(a)
     else:
-        closest = float('inf')
-        for x in food:
-            distance = mazeDistance(position , x , problem.startingGameState)
-            if distance < closest:
-                closest = distance
-            if closest == 1: #also a trick to save a few time
-                break
+        #a single search from the position that stops at the first food it reaches
+        closest = min(mazeDistances(position , food , problem.startingGameState , 1).values(), default=float('inf'))
     if for_dict not in problem.heuristicInfo :
 
         graph = Graph()
@@ -783,22 +1009,7 @@ def foodHeuristic(state, problem):
                 graph.add_edge(food[i] , food[j] , problem.heuristicInfo[food[i]][food[j]] )
         problem.heuristicInfo[for_dict] =  graph.kruskal()
 
-    
-    #uncomment this part and run 
-
-    #  python pacman.py -l mediumSearch -p AStarFoodSearchAgent
-    #  python pacman.py -l bigSearch -p AStarFoodSearchAgent
-
-    #to see it perform in the hard mazes
 
-    if foods > 60:
-        if state == problem.getStartState():
-            problem.heuristicInfo['prev'] = closest + problem.heuristicInfo[for_dict]
-        if closest + problem.heuristicInfo[for_dict] > problem.heuristicInfo['prev']:
-            return float("inf")
-        else :
-            problem.heuristicInfo['prev'] = closest + problem.heuristicInfo[for_dict]
-    
     return  closest + problem.heuristicInfo[for_dict]
     
     
@@ -838,6 +1049,32 @@ class ClosestDotSearchAgent(SearchAgent):
         return search.bfs(problem)
         
 
+class IncrementalClosestDotSearchAgent(ClosestDotSearchAgent):
+    """
+    Eats the closest dot over and over like ClosestDotSearchAgent, but plans
+    every segment with one D* Lite engine (search.DStarLite) that lives for
+    the whole game: when Pacman moves and a dot is eaten the engine only
+    repairs the distances that changed instead of searching the maze again.
+
+    The segments are not played out on game states: they are made of moves
+    of the problem, and the dots left are the goals of the engine.
+    """
+    def registerInitialState(self, state):
+        self.actions = []
+        problem = AnyFoodSearchProblem(state)
+        planner = search.DStarLite(problem, state.getFood().asList(), util.manhattanDistance)
+        while planner.goals:
+            nextPathSegment = planner.plan()
+            if not nextPathSegment:
+                raise Exception('No food can be reached from %s' % str(planner.start))
+            self.actions += nextPathSegment
+            # the segment ends on the closest dot, no other dot is on the way, and pacman eats it
+            planner.moveStart(planner.reached)
+            planner.removeGoal(planner.reached)
+        self.actionIndex = 0
+        print('Path found with cost %d.' % len(self.actions))
+        print('Search nodes expanded: %d' % planner.expanded)
+
 class AnyFoodSearchProblem(PositionSearchProblem):
     """
     A search problem for finding a path to any food.
@@ -893,4 +1130,16 @@ def mazeDistance(point1, point2, gameState):
     assert not walls[x1][y1], 'point1 is a wall: ' + str(point1)
     assert not walls[x2][y2], 'point2 is a wall: ' + str(point2)
     prob = PositionSearchProblem(gameState, start=point1, goal=point2, warn=False, visualize=False)
-    return len(search.bfs(prob))
+    return len(search.bidirectionalSearch(prob))
+
+def mazeDistances(point, targets, gameState, k=None):
+    """
+    Returns a dict of target -> maze distance from point to that target,
+    nearest first, for the k targets closest to point (all reachable
+    targets if k is None).  One search replaces a mazeDistance call per
+    target.
+
+    Example usage: mazeDistances( (2,4), food.asList(), gameState, 1)
+    """
+    prob = PositionSearchProblem(gameState, start=point, warn=False, visualize=False)
+    return search.nearestTargets(prob, targets, k)
@@ -0,0 +1,251 @@
+# searchBenchmarks.py
+# -------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Micro-benchmarks for the data structures and algorithms in util.py and
+search.py.  Run a benchmark by name from the command line:
+
+> python searchBenchmarks.py queue
+
+Running the file without arguments runs every benchmark.
+"""
+
+import sys
+import time
+
+import layout
+import pacman
+import search
+import searchAgents
+import util
+
+def loadProblem(layoutName, problemClass=searchAgents.PositionSearchProblem, **options):
+    "Builds a search problem for the named layout without starting a game."
+    lay = layout.getLayout(layoutName)
+    if lay == None: raise Exception('The layout ' + layoutName + ' cannot be found')
+    gameState = pacman.GameState()
+    gameState.initialize(lay, 0)
+    return problemClass(gameState, **options)
+
+def successorTable(problem):
+    """
+    Expands every reachable state once and returns a dict of state -> children,
+    so that a benchmark can time the frontier without the cost of expand().
+    """
+    table = {}
+    pending = [problem.getStartState()]
+    while pending:
+        state = pending.pop()
+        if state in table: continue
+        table[state] = [child for child, action, cost in problem.expand(state)]
+        pending.extend(table[state])
+    return table
+
+def timeIt(function, repeats):
+    "Returns the best wall-clock time of 'repeats' calls to function."
+    best = float('inf')
+    for i in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+###########################
+# FIFO queue (util.Queue) #
+###########################
+
+class ListQueue:
+    "The list-backed FIFO queue util.Queue used before it moved to a deque."
+    def __init__(self):
+        self.list = []
+
+    def push(self, item):
+        self.list.insert(0, item)
+
+    def pop(self):
+        return self.list.pop()
+
+    def isEmpty(self):
+        return len(self.list) == 0
+
+def bfsFrontierOps(table, start, queueClass):
+    "Runs a full breadth first sweep over table and returns the queue operations made."
+    queue = queueClass()
+    seen = {start}
+    queue.push(start)
+    operations = 1
+    while not queue.isEmpty():
+        state = queue.pop()
+        operations += 1
+        for child in table[state]:
+            if child not in seen:
+                seen.add(child)
+                queue.push(child)
+                operations += 1
+    return operations
+
+def benchmarkQueue(layoutName='openMaze', repeats=20):
+    "BFS frontier throughput of the old list queue against util.Queue."
+    problem = loadProblem(layoutName, warn=False, visualize=False)
+    table = successorTable(problem)
+    start = problem.getStartState()
+    print('BFS frontier on %s (%d states)' % (layoutName, len(table)))
+    for name, queueClass in [('list (before)', ListQueue), ('deque (util.Queue)', util.Queue)]:
+        operations = bfsFrontierOps(table, start, queueClass)
+        seconds = timeIt(lambda: bfsFrontierOps(table, start, queueClass), repeats)
+        print('  %-20s %8d ops  %8.2f ms  %10.0f ops/s' % (name, operations, seconds * 1000, operations / seconds))
+
+    # maze frontiers stay narrow, so also show a frontier wide enough for the O(n) insert to matter
+    width = 20000
+    print('Frontier of %d states' % width)
+    for name, queueClass in [('list (before)', ListQueue), ('deque (util.Queue)', util.Queue)]:
+        seconds = timeIt(lambda: fillAndDrain(queueClass, width), 3)
+        print('  %-20s %8d ops  %8.2f ms  %10.0f ops/s' % (name, 2 * width, seconds * 1000, 2 * width / seconds))
+
+def fillAndDrain(queueClass, width):
+    queue = queueClass()
+    for i in range(width):
+        queue.push(i)
+    while not queue.isEmpty():
+        queue.pop()
+
+###########################
+# Jump point search       #
+###########################
+
+def benchmarkJumpPoints(layoutNames=('bigMaze', 'openMaze', 'openSearch'), repeats=5):
+    "Expansions and time of A* with manhattanHeuristic against jump point search."
+    for layoutName in layoutNames:
+        print('PositionSearchProblem on %s' % layoutName)
+        for name, function in [('astar (manhattan)', lambda problem: search.aStarSearch(problem, searchAgents.manhattanHeuristic)),
+                               ('jps', search.jumpPointSearch)]:
+            problem = loadProblem(layoutName, warn=False, visualize=False)
+            actions = function(problem)
+            seconds = timeIt(lambda: function(loadProblem(layoutName, warn=False, visualize=False)), repeats)
+            print('  %-20s cost %4d  %6d expanded  %8.2f ms' % (name, problem.getCostOfActionSequence(actions), problem._expanded, seconds * 1000))
+
+###########################
+# Incremental replanning  #
+###########################
+
+def benchmarkReplanning(layoutNames=('bigCorners', 'mediumSearch', 'bigSearch'), repeats=3):
+    "Eating every dot with a fresh BFS per dot against one D* Lite engine for the whole game."
+    import io, contextlib
+    for layoutName in layoutNames:
+        lay = layout.getLayout(layoutName)
+        gameState = pacman.GameState()
+        gameState.initialize(lay, 0)
+        print('Closest dot on %s (%d dots)' % (layoutName, gameState.getNumFood()))
+        for name, agentClass in [('bfs per dot', searchAgents.ClosestDotSearchAgent), ('D* Lite', searchAgents.IncrementalClosestDotSearchAgent)]:
+            with contextlib.redirect_stdout(io.StringIO()):
+                agent = agentClass()
+                seconds = timeIt(lambda: agent.registerInitialState(gameState), repeats)
+            print('  %-20s cost %4d  %8.2f ms' % (name, len(agent.actions), seconds * 1000))
+
+###########################
+# A* tie breaking         #
+###########################
+
+def tieBreakCases(layoutProblems):
+    """
+    Yields (name, problem factory, heuristic) for the graphs (each one once)
+    and the heuristic and corner tests in test_cases, then for the named
+    layouts in layoutProblems.
+    """
+    import glob, os
+    import testParser
+    import searchTestClasses
+    graphs = set()
+    for path in sorted(glob.glob(os.path.join('test_cases', '*', '*.test'))):
+        test = testParser.TestParser(path).parse()
+        name = os.path.relpath(path, 'test_cases')[:-len('.test')]
+        if 'graph' in test and test['graph'] not in graphs:
+            graphs.add(test['graph'])
+            heuristic = searchTestClasses.parseHeuristic(test['heuristic']) if 'heuristic' in test else search.nullHeuristic
+            yield name, (lambda graph=test['graph']: searchTestClasses.GraphSearch(graph)), heuristic
+        elif 'layout' in test and ('heuristic' in test or test['class'].startswith('CornerHeuristic')):
+            lay = layout.Layout([line.strip() for line in test['layout'].split('\n')])
+            problemClass = getattr(searchAgents, test.get('searchProblemClass', 'CornersProblem' if 'heuristic' not in test else 'PositionSearchProblem'))
+            heuristic = getattr(searchAgents, test.get('heuristic', 'cornersHeuristic'))
+            yield name, (lambda lay=lay, problemClass=problemClass: layoutProblem(lay, problemClass)), heuristic
+    for layoutName, problemClass, heuristic in layoutProblems:
+        yield layoutName, (lambda layoutName=layoutName, problemClass=problemClass: layoutProblem(layout.getLayout(layoutName), problemClass)), heuristic
+
+def layoutProblem(lay, problemClass):
+    gameState = pacman.GameState()
+    gameState.initialize(lay, 0)
+    if problemClass == searchAgents.PositionSearchProblem:
+        return problemClass(gameState, warn=False, visualize=False)
+    return problemClass(gameState)
+
+def benchmarkTieBreaking(layoutProblems=(('mediumCorners', searchAgents.CornersProblem, searchAgents.cornersHeuristic),
+                                         ('bigCorners', searchAgents.CornersProblem, searchAgents.cornersHeuristic),
+                                         ('trickySearch', searchAgents.FoodSearchProblem, searchAgents.foodHeuristic))):
+    "Expansions of A* and greedy best-first search under every tie breaking policy"
+    searches = [('astar', search.aStarSearch), ('greedy', search.greedyBestFirstSearch)]
+    columns = [(name, tiebreak) for name, function in searches for tiebreak in search.TIE_BREAKS]
+    print('%-34s' % 'expansions (path cost)' + ''.join('%16s' % ('%s %s' % column) for column in columns))
+    totals = dict((column, 0) for column in columns)
+    for caseName, makeProblem, heuristic in tieBreakCases(layoutProblems):
+        row = '%-34s' % caseName
+        for name, function in searches:
+            for tiebreak in search.TIE_BREAKS:
+                result = function(makeProblem(), heuristic, statistics=True, tiebreak=tiebreak)
+                totals[(name, tiebreak)] += result.expanded
+                row += '%16s' % ('%d (%g)' % (result.expanded, result.cost))
+        print(row)
+    print('%-34s' % 'total' + ''.join('%16d' % totals[column] for column in columns))
+
+###########################
+# Grid backends           #
+###########################
+
+def benchmarkGrids(layoutName='bigSearch', sizes=(200, 1000), repeats=5):
+    "Bulk queries on a Grid, a BitGrid and (if NumPy is installed) an ArrayGrid"
+    import random
+    import importlib.util
+    import game
+    backends = [('Grid', lambda grid: grid), ('BitGrid', game.bitGrid)]
+    if importlib.util.find_spec('numpy') != None:
+        backends.append(('ArrayGrid', game.arrayGrid))
+    else:
+        print('(numpy is not installed, skipping ArrayGrid)')
+    grids = [('%s food' % layoutName, layout.getLayout(layoutName).food)]
+    for size in sizes:
+        grid = game.Grid(size, size)
+        for x in range(size):
+            for y in range(size):
+                grid[x][y] = random.random() < 0.3
+        grids.append(('random %dx%d' % (size, size), grid))
+    for gridName, grid in grids:
+        print('%s (%d of %d cells set)' % (gridName, grid.count(), grid.width * grid.height))
+        for name, convert in backends:
+            converted = convert(grid)
+            times = [timeIt(query, repeats) for query in (converted.count, converted.asList, converted.packBits, converted.asInt)]
+            print('  %-10s count %9.3f ms  asList %9.3f ms  packBits %9.3f ms  asInt %9.3f ms' % tuple([name] + [t * 1000 for t in times]))
+
+BENCHMARKS = {
+    'queue': benchmarkQueue,
+    'jps': benchmarkJumpPoints,
+    'replan': benchmarkReplanning,
+    'tiebreak': benchmarkTieBreaking,
+    'grids': benchmarkGrids,
+}
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or sorted(BENCHMARKS.keys())
+    for name in names:
+        if name not in BENCHMARKS:
+            raise Exception('Unknown benchmark %s; choose from %s' % (name, ', '.join(sorted(BENCHMARKS.keys()))))
+        BENCHMARKS[name]()
@@ -14,6 +14,8 @@
 
 import sys
 import re
+import io
+import contextlib
 import testClasses
 import textwrap
 
@@ -848,3 +850,141 @@ class CornerHeuristicPacman(testClasses.TestCase):
         handle.close()
         return True
 
+
+
+
+class BudgetedAgentTest(testClasses.TestCase):
+
+    def __init__(self, question, testDict):
+        super(BudgetedAgentTest, self).__init__(question, testDict)
+        self.layoutText = testDict['layout']
+        self.layoutName = testDict['layoutName']
+        self.agentArgs = dict(pair.split('=') for pair in testDict['agentArgs'].split(','))
+        self.maxMoves = int(testDict['maxMoves'])
+
+    def play(self, searchAgents):
+        #plays the game without ghosts, as pacman.py would, until pacman wins or maxMoves run out
+        lay = layout.Layout([l.strip() for l in self.layoutText.split('\n')])
+        state = pacman.GameState()
+        state.initialize(lay, 0)
+        moves = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            agent = searchAgents.SearchAgent(**self.agentArgs)
+            cache = getattr(agent, 'cache', None)
+            lookups = 0 if cache == None else -(cache.hits + cache.misses)
+            agent.registerInitialState(state)
+            while not state.isWin() and moves < self.maxMoves:
+                state = state.generateChild(0, agent.getAction(state))
+                moves += 1
+        if cache != None:
+            lookups += cache.hits + cache.misses
+        return state.isWin() , moves , lookups
+
+    def execute(self, grades, moduleDict, solutionDict):
+        searchAgents = moduleDict['searchAgents']
+        won , moves , lookups = self.play(searchAgents)
+
+        if not won:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('\tThe budgeted agent did not reach the goal in %d moves.' % self.maxMoves)
+            return False
+
+        #only registerInitialState looks up the solution cache, the searches started by getAction do not
+        if lookups > 1:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('\tThe solution cache counted %d lookups in one game instead of 1.' % lookups)
+            return False
+
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
+        grades.addMessage('\tmoves to the goal:\t%d' % moves)
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# The test only checks that the agent reaches the goal within maxMoves.\n')
+        handle.close()
+        return True
+
+
+# Scripted message queues for the coordinator of hashDistributedAStarSearch
+class ScriptedResults:
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+
+    def get(self, timeout=None):
+        if len(self.messages) == 0:
+            raise Exception('The coordinator asked for more messages than the script has')
+        return self.messages.pop(0)
+
+class SharedValue:
+
+    def __init__(self, value):
+        self.value = value
+
+class RecordedInbox:
+
+    def __init__(self):
+        self.messages = []
+
+    def put(self, message):
+        self.messages.append(message)
+
+class HashDistributedOrderTest(testClasses.TestCase):
+
+    def __init__(self, question, testDict):
+        super(HashDistributedOrderTest, self).__init__(question, testDict)
+        self.start = testDict['start_state']
+        self.script = [line.split() for line in testDict['messages'].split('\n') if line.strip() != '']
+
+    def scriptedMessages(self, search):
+        #one line per message: done | goal <cost> <state> | report <h> <state> | trace [<parent> <action>]
+        messages = []
+        workers = 0
+        for words in self.script:
+            if words[0] == 'goal':
+                messages.append(('goal', float(words[1]), words[2]))
+            elif words[0] == 'report':
+                messages.append(('report', workers, float(words[1]), words[2], search.SearchMonitor()))
+                workers += 1
+            elif words[0] == 'trace':
+                messages.append(('trace', (words[1], words[2]) if len(words) == 3 else (None, ' ')))
+            else:
+                messages.append(tuple(words))
+        return messages , workers
+
+    def solution(self, search):
+        messages , workers = self.scriptedMessages(search)
+        inboxes = [RecordedInbox() for i in range(workers)]
+        stop = SharedValue(0)
+        monitor = search.SearchMonitor()
+        actions , reason , goal = search.hdaCoordinate(self.start, inboxes, ScriptedResults(messages), stop, monitor)
+        return actions , reason
+
+    def execute(self, grades, moduleDict, solutionDict):
+        search = moduleDict['search']
+        gold_solution = solutionDict['solution'].split()
+        gold_reason = solutionDict['reason']
+        solution , reason = self.solution(search)
+
+        if solution != gold_solution or reason != gold_reason:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('\tstudent solution:\t%s (%s)' % (' '.join(solution), reason))
+            grades.addMessage('\tcorrect solution:\t%s (%s)' % (' '.join(gold_solution), gold_reason))
+            return False
+
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tsolution:\t%s (%s)' % (' '.join(solution), reason))
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        search = moduleDict['search']
+        solution , reason = self.solution(search)
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('solution: "%s"\n' % ' '.join(solution))
+        handle.write('reason: "%s"\n' % reason)
+        handle.close()
+        return True
@@ -29,6 +29,7 @@
 import sys
 import inspect
 import heapq, random
+from collections import deque, OrderedDict
 
 
 class FixedRandom:
@@ -150,18 +151,22 @@ class Stack:
 class Queue:
     "A container with a first-in-first-out (FIFO) queuing policy."
     def __init__(self):
-        self.list = []
+        self.list = deque()
 
     def push(self,item):
         "Enqueue the 'item' into the queue"
-        self.list.insert(0,item)
+        self.list.append(item)
+
+    def pushMany(self, items):
+        "Enqueue every item of 'items', in order"
+        self.list.extend(items)
 
     def pop(self):
         """
           Dequeue the earliest enqueued item still in the queue. This
           operation removes the item from the queue.
         """
-        return self.list.pop()
+        return self.list.popleft()
 
     def isEmpty(self):
         "Returns true if the queue is empty"
@@ -173,38 +178,240 @@ class PriorityQueue:
       has a priority associated with it and the client is usually interested
       in quick retrieval of the lowest-priority item in the queue. This
       data structure allows O(1) access to the lowest-priority item.
+
+      The heap is position-indexed: every queued item is mapped to its slot
+      in the heap, so changing the priority of a queued item sifts a single
+      entry in O(log n) instead of scanning and re-heapifying the whole
+      heap.  Items must therefore be hashable, and an item is queued at most
+      once.
+
+      Pushing an item that is already queued does not add a second entry (as
+      the original list-backed queue did): it gives the existing entry the
+      new priority, higher or lower, and breaks ties as if the item had just
+      been pushed.  update() is the decrease-key operation: it only ever
+      lowers the priority of a queued item and pushes an item that is not
+      queued.  decreaseKey() does the same for an item known to be queued.
     """
     def  __init__(self):
         self.heap = []
+        self.index = {}
         self.count = 0
 
     def push(self, item, priority):
+        if item in self.index:
+            self._reprioritize(item, priority)
+            return
         entry = (priority, self.count, item)
-        heapq.heappush(self.heap, entry)
         self.count += 1
+        self.heap.append(entry)
+        self.index[item] = len(self.heap) - 1
+        self._siftUp(len(self.heap) - 1)
 
     def pop(self):
-        (_, _, item) = heapq.heappop(self.heap)
+        heap = self.heap
+        last = heap.pop()
+        if heap:
+            (_, _, item) = heap[0]
+            heap[0] = last
+            self.index[last[2]] = 0
+            self._siftDown(0)
+        else:
+            (_, _, item) = last
+        del self.index[item]
         return item
 
     def isEmpty(self):
         return len(self.heap) == 0
 
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, item):
+        return item in self.index
+
+    def contains(self, item):
+        "Returns true if 'item' is waiting in the queue"
+        return item in self.index
+
+    def peekPriority(self):
+        "Returns the lowest priority in the queue without removing its item"
+        return self.heap[0][0]
+
+    def decreaseKey(self, item, priority):
+        """
+        Lowers the priority of an item that is already in the queue.  A
+        priority that is not lower than the current one is ignored; an item
+        that is not queued raises a KeyError.
+        """
+        if priority < self.heap[self.index[item]][0]:
+            self._reprioritize(item, priority)
+
     def update(self, item, priority):
         # If item already in priority queue with higher priority, update its priority and rebuild the heap.
         # If item already in priority queue with equal or lower priority, do nothing.
         # If item not in priority queue, do the same thing as self.push.
-        for index, (p, c, i) in enumerate(self.heap):
-            if i == item:
-                if p <= priority:
-                    break
-                del self.heap[index]
-                self.heap.append((priority, c, item))
-                heapq.heapify(self.heap)
-                break
+        position = self.index.get(item)
+        if position is None:
+            self.push(item, priority)
+        elif priority < self.heap[position][0]:
+            self._reprioritize(item, priority)
+
+    def remove(self, item):
+        "Takes a queued item out of the queue; an item that is not queued raises a KeyError"
+        position = self.index.pop(item)
+        last = self.heap.pop()
+        if position < len(self.heap):
+            self.heap[position] = last
+            self.index[last[2]] = position
+            self._siftUp(position)
+            self._siftDown(self.index[last[2]])
+
+    def _reprioritize(self, item, priority):
+        # The entry gets a fresh count so ties break exactly as if the item
+        # had been pushed again.
+        position = self.index[item]
+        old = self.heap[position][0]
+        self.heap[position] = (priority, self.count, item)
+        self.count += 1
+        if priority < old:
+            self._siftUp(position)
         else:
+            self._siftDown(position)
+
+    def _siftUp(self, position):
+        heap, index = self.heap, self.index
+        entry = heap[position]
+        while position > 0:
+            parentPosition = (position - 1) >> 1
+            parent = heap[parentPosition]
+            if entry < parent:
+                heap[position] = parent
+                index[parent[2]] = position
+                position = parentPosition
+            else:
+                break
+        heap[position] = entry
+        index[entry[2]] = position
+
+    def _siftDown(self, position):
+        heap, index = self.heap, self.index
+        size = len(heap)
+        entry = heap[position]
+        child = 2 * position + 1
+        while child < size:
+            right = child + 1
+            if right < size and heap[right] < heap[child]:
+                child = right
+            if heap[child] < entry:
+                heap[position] = heap[child]
+                index[heap[position][2]] = position
+                position = child
+                child = 2 * position + 1
+            else:
+                break
+        heap[position] = entry
+        index[entry[2]] = position
+
+class BucketPriorityQueue:
+    """
+      A bucket queue (as in Dial's algorithm) with the same interface as
+      PriorityQueue.  Items are kept in one FIFO bucket per distinct
+      priority, and ties are broken in insertion order exactly like
+      PriorityQueue.  The distinct priorities are kept in a heap, so with k
+      of them queued a push that opens a new bucket, or a pop that empties
+      one, costs O(log k).  Every other push is O(1), and so is every other
+      pop, amortized over the stale entries it skips (see below).  Searches
+      with small integer step costs and integer heuristics have very few
+      distinct priorities at any time, which is where this beats the
+      O(log n) of PriorityQueue in the number of queued items.
+
+      Changing the priority of a queued item appends it to its new bucket and
+      leaves the old entry behind to be skipped, so the queue stays correct
+      for any priorities, it is just fastest when they are few and integral.
+    """
+    def  __init__(self):
+        self.buckets = {}
+        self.keys = []
+        self.entries = {}
+        self.count = 0
+
+    def push(self, item, priority):
+        # pushing a queued item re-prioritizes it, as in PriorityQueue
+        self.entries[item] = (priority, self.count)
+        bucket = self.buckets.get(priority)
+        if bucket is None:
+            bucket = self.buckets[priority] = deque()
+            heapq.heappush(self.keys, priority)
+        bucket.append((self.count, item))
+        self.count += 1
+
+    def pop(self):
+        (_, item) = self._front()
+        self.buckets[self.keys[0]].popleft()
+        del self.entries[item]
+        return item
+
+    def isEmpty(self):
+        return len(self.entries) == 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, item):
+        return item in self.entries
+
+    def contains(self, item):
+        "Returns true if 'item' is waiting in the queue"
+        return item in self.entries
+
+    def peekPriority(self):
+        "Returns the lowest priority in the queue without removing its item"
+        self._front()
+        return self.keys[0]
+
+    def decreaseKey(self, item, priority):
+        """
+        Lowers the priority of an item that is already in the queue.  A
+        priority that is not lower than the current one is ignored; an item
+        that is not queued raises a KeyError.
+        """
+        if priority < self.entries[item][0]:
+            self.push(item, priority)
+
+    def update(self, item, priority):
+        # If item already in priority queue with higher priority, update its priority.
+        # If item already in priority queue with equal or lower priority, do nothing.
+        # If item not in priority queue, do the same thing as self.push.
+        entry = self.entries.get(item)
+        if entry is None or priority < entry[0]:
             self.push(item, priority)
 
+    def remove(self, item):
+        "Takes a queued item out of the queue; an item that is not queued raises a KeyError"
+        # the entry left in its bucket is stale from now on and gets skipped
+        del self.entries[item]
+
+    def _front(self):
+        # Drops stale entries and empty buckets until the first entry of the
+        # lowest bucket is live, and returns that entry.
+        buckets, keys, entries = self.buckets, self.keys, self.entries
+        while True:
+            bucket = buckets[keys[0]]
+            while bucket:
+                (count, item) = bucket[0]
+                entry = entries.get(item)
+                if entry is not None and entry[1] == count:
+                    return bucket[0]
+                bucket.popleft()
+            del buckets[heapq.heappop(keys)]
+
+def isIntegral(number):
+    "Returns true if number has no fractional part"
+    try:
+        return float(number).is_integer()
+    except (TypeError, ValueError, OverflowError):
+        return False
+
 class PriorityQueueWithFunction(PriorityQueue):
     """
     Implements a priority queue with the same push/pop signature of the
@@ -221,6 +428,35 @@ class PriorityQueueWithFunction(PriorityQueue):
         "Adds an item to the queue with priority from the priority function"
         PriorityQueue.push(self, item, self.priorityFunction(item))
 
+class LRUCache:
+    """
+    A dict of at most capacity entries that forgets the least recently used
+    entry when a new one would not fit.  get and put both count as a use.
+    """
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+
+    def get(self, key, default=None):
+        "Returns the value stored under key, or default"
+        if key not in self.entries:
+            return default
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, value):
+        "Stores value under key, forgetting the least recently used entry if the cache is full"
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
 
 def manhattanDistance( xy1, xy2 ):
     "Returns the Manhattan distance between points xy1 and xy2"